@@ -5,7 +5,7 @@ import sys
 from scripts.prep.validate_inputs import validate_all, print_report
 from scripts.prep.build_graphs import build_all
 from scripts.metrics.evaluate_metrics import evaluate_all
-from scripts.common.io_utils import ensure_dir, write_json, write_yaml, read_json, read_yaml
+from scripts.common.io_utils import write_any
 
 
 BUILD_DIR = Path("tesa-machine/build")
@@ -14,49 +14,32 @@ BUILD_DIR = Path("tesa-machine/build")
 def cmd_validate(args):
     rpt = validate_all()
     print_report(rpt)
-    # opcionalmente salvar relatório
+    # opcionalmente salvar relatório (json/yaml pela extensão; padrão: json)
     if args.output:
-        out_path = Path(args.output)
-        ensure_dir(out_path.parent)
-        if out_path.suffix.lower() == ".json":
-            write_json(out_path, rpt, indent=2)
-        elif out_path.suffix.lower() in (".yml", ".yaml"):
-            write_yaml(out_path, rpt)
-        else:
-            # padrão: json
-            write_json(out_path.with_suffix(".json"), rpt, indent=2)
+        write_any(args.output, rpt, indent=2)
 
 
 def cmd_build_graphs(args):
-    index = build_all(save_formats=tuple(args.format))
+    index = build_all(save_formats=tuple(args.format), max_workers=args.max_workers)
     print(f"Construídos {len(index)} grafo(s).")
     # salva índice adicional se solicitado
     if args.output:
-        out_path = Path(args.output)
-        ensure_dir(out_path.parent)
-        payload = {"graphs": index}
-        if out_path.suffix.lower() == ".json":
-            write_json(out_path, payload, indent=2)
-        elif out_path.suffix.lower() in (".yml", ".yaml"):
-            write_yaml(out_path, payload)
-        else:
-            write_json(out_path.with_suffix(".json"), payload, indent=2)
+        write_any(args.output, {"graphs": index}, indent=2)
 
 
 def cmd_eval_metrics(args):
     selected = args.metrics if args.metrics else None
-    out = evaluate_all(selected_metrics=selected)
+    out = evaluate_all(
+        selected_metrics=selected,
+        max_workers=args.max_workers,
+        use_cache=args.cache,
+        save_formats=tuple(args.format),
+    )
     print(f"Avaliações concluídas para {len(out['results'])} entrada(s).")
+    print(f"Cache: {out['cache']['hits']} acerto(s), {out['cache']['misses']} falta(s).")
     # salva índice adicional se solicitado
     if args.output:
-        out_path = Path(args.output)
-        ensure_dir(out_path.parent)
-        if out_path.suffix.lower() == ".json":
-            write_json(out_path, out, indent=2)
-        elif out_path.suffix.lower() in (".yml", ".yaml"):
-            write_yaml(out_path, out)
-        else:
-            write_json(out_path.with_suffix(".json"), out, indent=2)
+        write_any(args.output, out, indent=2)
 
 
 def build_parser():
@@ -77,8 +60,15 @@ def build_parser():
         "-f", "--format",
         nargs="+",
         choices=["json", "yaml"],
-        default=["json", "yaml"],
-        help="Formato(s) de saída dos grafos."
+        default=["json"],
+        help="Formato(s) de saída dos grafos (YAML é opcional)."
+    )
+    p_build.add_argument(
+        "-j", "--max-workers", "--workers",
+        dest="max_workers",
+        type=int,
+        default=1,
+        help="Nº de processos para construir os grafos em paralelo (padrão: 1, serial)."
     )
     p_build.add_argument("-o", "--output", help="Caminho para salvar índice adicional.", default=None)
     p_build.set_defaults(func=cmd_build_graphs)
@@ -90,6 +80,25 @@ def build_parser():
         nargs="+",
         help="Lista de métricas a executar (por nome). Se omitido, executa todas disponíveis."
     )
+    p_eval.add_argument(
+        "-j", "--max-workers",
+        type=int,
+        default=1,
+        help="Nº de processos para avaliar métricas em paralelo (padrão: 1, serial)."
+    )
+    p_eval.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Reutiliza resultados em cache por (hash do grafo, hash dos parâmetros)."
+    )
+    p_eval.add_argument(
+        "-f", "--format",
+        nargs="+",
+        choices=["json", "yaml"],
+        default=["json"],
+        help="Formato(s) de saída dos resultados (YAML é opcional)."
+    )
     p_eval.add_argument("-o", "--output", help="Caminho para salvar índice adicional.", default=None)
     p_eval.set_defaults(func=cmd_eval_metrics)
 
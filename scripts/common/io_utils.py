@@ -1,7 +1,28 @@
+import hashlib
 import json
+import math
+import os
+import numpy as np
 import yaml
+from contextlib import contextmanager
 from pathlib import Path
 
+# Preferir o backend libyaml (C) quando disponível; cai para o puro-Python.
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # pragma: no cover - depende da build do PyYAML
+    from yaml import SafeLoader, SafeDumper
+
+# orjson é opcional: acelera leitura/escrita de JSON; fallback para stdlib.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+# Cache de leituras estruturadas: YAMLs pequenos ganham um espelho JSON.
+STRUCTURED_CACHE_DIR = Path("tesa-machine/build/.cache/structured")
+STRUCTURED_SIZE_THRESHOLD = 128 * 1024
+
 
 def ensure_dir(path):
     """
@@ -12,21 +33,152 @@ def ensure_dir(path):
     return p
 
 
+def _loads_bytes(buf):
+    """
+    Decodifica JSON em bytes. orjson rejeita NaN/Infinity e inteiros além de 64 bits,
+    que o json padrão aceita (e que saídas antigas contêm): nesses casos, relê com json.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(buf)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(buf)
+
+
 def read_json(path):
     """
     Lê um arquivo JSON e retorna o objeto Python.
     """
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _loads_bytes(Path(path).read_bytes())
+
+
+def _has_non_finite(obj):
+    """
+    True se 'obj' contém float NaN/±inf (também em escalares/arrays numpy).
+    """
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, (float, np.floating)):
+            if not math.isfinite(x):
+                return True
+        elif isinstance(x, dict):
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple)):
+            stack.extend(x)
+        elif isinstance(x, np.ndarray) and x.dtype.kind in "fc":
+            if not np.isfinite(x).all():
+                return True
+    return False
+
+
+def _json_default(x):
+    """
+    Tipos numpy para o json padrão (o caminho orjson já os serializa nativamente).
+    """
+    if isinstance(x, np.ndarray):
+        return x.tolist()
+    if isinstance(x, np.generic):
+        return x.item()
+    raise TypeError(f"Objeto do tipo {type(x).__name__} não é serializável em JSON")
+
+
+def _orjson_dumps(obj, option):
+    """
+    orjson.dumps, ou None quando o resultado divergiria do json padrão: tipos não
+    suportados, inteiros além de 64 bits, ou NaN/±inf (que o orjson gravaria como
+    null em silêncio). A varredura de não finitos só roda se a saída contiver null.
+    """
+    try:
+        buf = orjson.dumps(obj, option=option)
+    except (orjson.JSONEncodeError, TypeError):
+        return None
+    if b"null" in buf and _has_non_finite(obj):
+        return None
+    return buf
+
+
+def dumps_json_bytes(obj, *, indent=2):
+    """
+    Serializa um objeto Python em JSON (bytes UTF-8) numa única passada.
+    Usa orjson quando disponível (indentação 2 ou compacta). Objetos com NaN/±inf
+    vão para o json padrão, que os grava como NaN/Infinity (como antes do orjson).
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        buf = _orjson_dumps(obj, option)
+        if buf is not None:
+            return buf
+    return json.dumps(obj, ensure_ascii=False, indent=indent, default=_json_default).encode("utf-8")
 
 
 def write_json(path, obj, *, indent=2):
     """
-    Escreve um objeto Python em JSON.
+    Escreve um objeto Python em JSON (serialização única + uma escrita).
     """
     ensure_dir(Path(path).parent)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=indent)
+    with open(path, "wb") as f:
+        f.write(dumps_json_bytes(obj, indent=indent))
+
+
+def write_payload(base, obj, formats=("json",), *, indent=2):
+    """
+    Grava 'obj' em <base>.json e/ou <base>.yaml conforme 'formats'.
+    O objeto é serializado uma vez por formato e cada arquivo recebe uma
+    única escrita. Retorna {"json": caminho|None, "yaml": caminho|None}.
+    """
+    paths = {"json": None, "yaml": None}
+    if "json" in formats:
+        paths["json"] = str(base) + ".json"
+        write_json(paths["json"], obj, indent=indent)
+    if "yaml" in formats:
+        paths["yaml"] = str(base) + ".yaml"
+        write_yaml(paths["yaml"], obj)
+    return paths
+
+
+def _dumps_compact(obj):
+    """
+    Serializa um objeto em JSON compacto (str), com orjson se disponível.
+    """
+    if orjson is not None:
+        buf = _orjson_dumps(obj, orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        if buf is not None:
+            return buf.decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, default=_json_default)
+
+
+@contextmanager
+def stream_json_list(path, key):
+    """
+    Grava incrementalmente {"<key>": [item, ...]} em JSON, um item por linha.
+    Fornece uma função emit(item); o arquivo só substitui o destino ao final
+    sem erros (escrita em .tmp + os.replace).
+    """
+    path = Path(path)
+    ensure_dir(path.parent)
+    tmp = path.with_name(path.name + ".tmp")
+    first = True
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("{" + json.dumps(key) + ": [")
+
+        def emit(item):
+            nonlocal first
+            f.write("\n  " if first else ",\n  ")
+            f.write(_dumps_compact(item))
+            first = False
+
+        try:
+            yield emit
+        except BaseException:
+            f.close()
+            tmp.unlink(missing_ok=True)
+            raise
+        f.write("]}\n" if first else "\n]}\n")
+    os.replace(tmp, path)
 
 
 def read_yaml(path):
@@ -34,16 +186,93 @@ def read_yaml(path):
     Lê um arquivo YAML e retorna o objeto Python.
     """
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
 
 
 def write_yaml(path, obj):
     """
-    Escreve um objeto Python em YAML.
+    Escreve um objeto Python em YAML (emissão em memória + uma única escrita,
+    em vez das muitas escritas pequenas do emissor direto no arquivo).
     """
     ensure_dir(Path(path).parent)
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(obj, f, sort_keys=False, allow_unicode=True)
+    text = yaml.dump(obj, Dumper=SafeDumper, sort_keys=False, allow_unicode=True)
+    with open(path, "wb") as f:
+        f.write(text.encode("utf-8"))
+
+
+def _structured_cache_path(p, st):
+    """
+    Caminho do espelho JSON de um YAML, chaveado por caminho, mtime e tamanho.
+    """
+    key = f"{p.resolve()}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8")
+    digest = hashlib.blake2b(key, digest_size=16).hexdigest()
+    return STRUCTURED_CACHE_DIR / f"{p.stem}-{digest}.json"
+
+
+def read_structured(path):
+    """
+    Lê JSON ou YAML conforme a extensão.
+    YAMLs pequenos (< STRUCTURED_SIZE_THRESHOLD) são lidos de um espelho JSON
+    em cache quando existir; caso contrário, o espelho é gravado na primeira
+    leitura (somente se o conteúdo for representável em JSON sem perdas).
+    """
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix == ".json":
+        return read_json(p)
+    if suffix not in (".yml", ".yaml"):
+        raise ValueError(f"Formato não suportado: {p}")
+
+    st = p.stat()
+    if st.st_size >= STRUCTURED_SIZE_THRESHOLD:
+        return read_yaml(p)
+
+    cache_path = _structured_cache_path(p, st)
+    if cache_path.exists():
+        try:
+            return read_json(cache_path)
+        except ValueError:
+            pass  # espelho corrompido: relê o YAML e regrava
+
+    data = read_yaml(p)
+    try:
+        text = json.dumps(data, ensure_ascii=False)
+        if json.loads(text) == data:
+            write_text(cache_path, text)
+    except (TypeError, ValueError, OSError):
+        pass  # tipos não-JSON (datas, chaves não-str) ou cache indisponível
+    return data
+
+
+def write_yaml_index(path, obj):
+    """
+    Escreve índices/resumos em YAML a partir de uma cópia normalizada via JSON:
+    só tipos nativos simples e nenhuma referência compartilhada, de modo que o
+    dumper C não precisa rastrear âncoras/aliases nem representers especiais.
+    """
+    write_yaml(path, _loads_bytes(dumps_json_bytes(obj, indent=None)))
+
+
+def write_any(path, obj, *, indent=2):
+    """
+    Escreve 'obj' no formato indicado pela extensão de 'path' (.json, .yml, .yaml).
+    Extensões desconhecidas gravam JSON trocando a extensão para .json.
+    Retorna o caminho efetivamente escrito.
+    """
+    p = Path(path)
+    writer = _WRITERS_BY_SUFFIX.get(p.suffix.lower())
+    if writer is None:
+        p = p.with_suffix(".json")
+        writer = _WRITERS_BY_SUFFIX[".json"]
+    writer(p, obj, indent)
+    return p
+
+
+_WRITERS_BY_SUFFIX = {
+    ".json": lambda p, obj, indent: write_json(p, obj, indent=indent),
+    ".yml": lambda p, obj, indent: write_yaml(p, obj),
+    ".yaml": lambda p, obj, indent: write_yaml(p, obj),
+}
 
 
 def write_text(path, text):
@@ -63,6 +292,21 @@ def read_text(path):
         return f.read()
 
 
+def file_digest(path):
+    """
+    Hash BLAKE2b (hex) do conteúdo de um arquivo.
+    """
+    return hashlib.blake2b(Path(path).read_bytes(), digest_size=16).hexdigest()
+
+
+def canonical_digest(obj):
+    """
+    Hash BLAKE2b (hex) de um objeto via JSON canônico (chaves ordenadas).
+    """
+    text = json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
 def file_exists(path):
     """
     Verifica se um arquivo existe.
@@ -78,6 +322,24 @@ def list_files(dir_path, pattern="*"):
     return sorted([str(x) for x in p.glob(pattern) if x.is_file()])
 
 
+def list_structured_files(dir_path, exclude_stems=("index",)):
+    """
+    Lista arquivos .json/.yaml/.yml de um diretório, um por nome-base:
+    quando há JSON e YAML do mesmo objeto, só o JSON (de leitura muito
+    mais rápida) é retornado. Ordem: JSONs ordenados, depois YAMLs.
+    """
+    p = Path(dir_path)
+    files = []
+    seen = set()
+    for ext in ("*.json", "*.yaml", "*.yml"):
+        for x in sorted(p.glob(ext)):
+            if x.stem in exclude_stems or x.stem in seen or not x.is_file():
+                continue
+            seen.add(x.stem)
+            files.append(x)
+    return files
+
+
 def list_dirs(dir_path):
     """
     Lista subdiretórios imediatos.
@@ -1,17 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
+from itertools import chain
+import functools
+import hashlib
+import inspect
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+import os
 
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
 import yaml
 
-from scripts.common.io_utils import read_yaml, read_json, list_files, ensure_dir, write_json, write_yaml
+from scripts.common.io_utils import (
+    read_yaml,
+    read_json,
+    read_structured,
+    list_files,
+    ensure_dir,
+    write_json,
+    write_yaml_index,
+    write_payload,
+    file_digest,
+    canonical_digest,
+)
 
 BUILD_DIR = Path("tesa-machine/build")
 GRAPHS_DIR = BUILD_DIR / "graphs"
 DATA_DIR = Path("tesa-machine/data")
 METRICS_CATALOG = DATA_DIR / "metrics" / "metrics_catalog.yaml"
 RESULTS_DIR = BUILD_DIR / "metrics"
+CACHE_DIR = RESULTS_DIR / ".cache"
+# Incremente ao mudar algo que as métricas usam fora do próprio corpo (helpers,
+# LightGraph, formato do resultado): invalida todo o cache de métricas.
+METRIC_CACHE_VERSION = 1
+
+# Cache de grafos carregados no processo: (path, st_mtime_ns, st_size) -> (gid, grafo, meta)
+_GRAPH_CACHE: Dict[Tuple[str, int, int], Tuple[str, "LightGraph", Dict[str, Any]]] = {}
 
 
 @dataclass
@@ -22,12 +48,98 @@ class MetricConfig:
     assumptions: str
 
 
-def _load_graphs() -> List[Tuple[str, nx.Graph, Dict[str, Any]]]:
+@dataclass
+class LightGraph:
+    """
+    Representação enxuta de um grafo não-orientado para as métricas:
+    - nodes: ids dos nós (ordem do arquivo serializado)
+    - node_w: pesos dos nós (float64)
+    - edge_u, edge_v: índices dos extremos de cada aresta (int64)
+    - edge_c: condutâncias das arestas (float64)
+    - indptr, indices: adjacência simétrica em CSR
+    - meta: atributos globais (id, class, n, rho, source_digest)
+    """
+    nodes: List[str]
+    node_w: np.ndarray
+    edge_u: np.ndarray
+    edge_v: np.ndarray
+    edge_c: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    meta: Dict[str, Any]
+
+    @classmethod
+    def from_serial(cls, data: Dict[str, Any], meta: Dict[str, Any]) -> "LightGraph":
+        """
+        Constrói o grafo diretamente do dicionário serializado (nodes/edges).
+        """
+        nrecs = data.get("nodes", [])
+        erecs = data.get("edges", [])
+        nodes = [nrec.get("id") for nrec in nrecs]
+        idx = {v: i for i, v in enumerate(nodes)}
+        # Extremos das arestas numa única passada, sem dicts intermediários por registro
+        try:
+            ends = np.fromiter(
+                chain.from_iterable((idx[e.get("u")], idx[e.get("v")]) for e in erecs),
+                dtype=np.int64,
+                count=2 * len(erecs),
+            ).reshape(-1, 2)
+        except KeyError as e:
+            raise ValueError(f"Aresta refere nó inexistente: {e}")
+        edge_u = np.ascontiguousarray(ends[:, 0])
+        edge_v = np.ascontiguousarray(ends[:, 1])
+        node_w = np.fromiter((nrec.get("weight", 1.0) for nrec in nrecs), dtype=np.float64, count=len(nrecs))
+        edge_c = np.fromiter((e.get("conductance", 1.0) for e in erecs), dtype=np.float64, count=len(erecs))
+        n = len(nodes)
+        adj = sp.csr_matrix(
+            (np.ones(2 * len(erecs)), (np.concatenate([edge_u, edge_v]), np.concatenate([edge_v, edge_u]))),
+            shape=(n, n),
+        )
+        return cls(
+            nodes=nodes,
+            node_w=node_w,
+            edge_u=edge_u,
+            edge_v=edge_v,
+            edge_c=edge_c,
+            indptr=adj.indptr,
+            indices=adj.indices,
+            meta=meta,
+        )
+
+    def number_of_nodes(self) -> int:
+        return len(self.nodes)
+
+    def number_of_edges(self) -> int:
+        return int(self.edge_c.size)
+
+    def to_networkx(self) -> nx.Graph:
+        """
+        Converte para nx.Graph (para código que realmente precisa do NetworkX).
+        """
+        G = nx.Graph()
+        G.graph.update(self.meta)
+        G.add_nodes_from((v, {"weight": float(w)}) for v, w in zip(self.nodes, self.node_w))
+        G.add_edges_from(
+            (self.nodes[i], self.nodes[j], {"conductance": float(c)})
+            for i, j, c in zip(self.edge_u.tolist(), self.edge_v.tolist(), self.edge_c)
+        )
+        return G
+
+
+def clear_graph_cache() -> None:
+    """
+    Esvazia o cache de grafos carregados (útil em testes).
+    """
+    _GRAPH_CACHE.clear()
+
+
+def _load_graphs() -> List[Tuple[str, LightGraph, Dict[str, Any]]]:
     """
     Carrega todos os grafos previamente construídos em GRAPHS_DIR (*.json ou *.yaml).
-    Retorna lista de tuplas (graph_id, nx_graph, metadata_dict).
+    Retorna lista de tuplas (graph_id, light_graph, metadata_dict).
+    Arquivos inalterados (mesmo mtime e tamanho) são servidos do _GRAPH_CACHE.
     """
-    graphs: List[Tuple[str, nx.Graph, Dict[str, Any]]] = []
+    graphs: List[Tuple[str, LightGraph, Dict[str, Any]]] = []
     # Preferir JSON pela velocidade
     files = list_files(GRAPHS_DIR, pattern="*.json")
     if not files:
@@ -35,48 +147,51 @@ def _load_graphs() -> List[Tuple[str, nx.Graph, Dict[str, Any]]]:
     if not files:
         raise FileNotFoundError(f"Nenhum grafo encontrado em {GRAPHS_DIR}. Execute scripts/prep/build_graphs.py primeiro.")
 
-    def _load_one(path: str) -> Tuple[str, nx.Graph, Dict[str, Any]]:
+    def _load_one(path: str) -> Tuple[str, LightGraph, Dict[str, Any]]:
         if path.endswith(".json"):
             data = read_json(path)
         else:
             data = read_yaml(path)
         gmeta = data.get("graph", {})
         gid = gmeta.get("id") or Path(path).stem
-        G = nx.Graph()
-        # atributos globais
-        G.graph.update({
+        G = LightGraph.from_serial(data, meta={
             "id": gid,
             "class": gmeta.get("class"),
             "n": gmeta.get("n"),
             "rho": gmeta.get("rho"),
+            # hash do arquivo serializado (chave de cache das métricas)
+            "source_digest": file_digest(path),
         })
-        # nós
-        for nrec in data.get("nodes", []):
-            nid = nrec.get("id")
-            attrs = {k: v for k, v in nrec.items() if k != "id"}
-            G.add_node(nid, **attrs)
-        # arestas
-        for erec in data.get("edges", []):
-            u, v = erec.get("u"), erec.get("v")
-            attrs = {k: v_ for k, v_ in erec.items() if k not in ("u", "v")}
-            G.add_edge(u, v, **attrs)
         return gid, G, gmeta
 
     for p in files:
         if p.endswith("index.json") or p.endswith("index.yaml"):
             continue
-        gid, G, meta = _load_one(p)
-        graphs.append((gid, G, meta))
+        st = os.stat(p)
+        key = (p, st.st_mtime_ns, st.st_size)
+        entry = _GRAPH_CACHE.get(key)
+        if entry is None:
+            entry = _load_one(p)
+            _GRAPH_CACHE[key] = entry
+        graphs.append(entry)
     return graphs
 
 
 def _load_metrics_catalog() -> List[MetricConfig]:
     """
-    Carrega o catálogo de métricas do YAML.
+    Carrega o catálogo de métricas do YAML (memoizado por caminho e mtime).
     """
     if not METRICS_CATALOG.exists():
         raise FileNotFoundError(f"Catálogo de métricas não encontrado: {METRICS_CATALOG}")
-    data = read_yaml(METRICS_CATALOG)
+    return list(_parse_metrics_catalog(str(METRICS_CATALOG), METRICS_CATALOG.stat().st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_metrics_catalog(catalog_path: str, mtime_ns: int) -> Tuple[MetricConfig, ...]:
+    """
+    Lê e normaliza o catálogo; mtime_ns invalida a entrada quando o arquivo muda.
+    """
+    data = read_structured(catalog_path)
     metrics_raw = data.get("metrics", [])
     out: List[MetricConfig] = []
     for m in metrics_raw:
@@ -86,21 +201,21 @@ def _load_metrics_catalog() -> List[MetricConfig]:
             params=m.get("params", {}) or {},
             assumptions=m.get("assumptions", "") or "",
         ))
-    return out
+    return tuple(out)
 
 
 # Implementações de métricas de exemplo (placeholders) -------------------------
 
-def metric_arakelov_ref(G: nx.Graph, params: Dict[str, Any]) -> Dict[str, Any]:
+def metric_arakelov_ref(G: LightGraph, params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Placeholder para 'arakelov_ref'.
     Calcula alguns agregados simples respeitando pesos e condutâncias.
     """
     n = G.number_of_nodes()
     m = G.number_of_edges()
-    total_w = float(sum(G.nodes[v].get("weight", 1.0) for v in G.nodes))
-    total_c = float(sum(G.edges[e].get("conductance", 1.0) for e in G.edges))
-    rho = float(G.graph.get("rho", 1.0))
+    total_w = float(G.node_w.sum())
+    total_c = float(G.edge_c.sum())
+    rho = float(G.meta.get("rho", 1.0))
     norm_C0 = float(params.get("norm_C0", 1.0))
     norm_C1 = float(params.get("norm_C1", 1.0))
     norm_C2 = float(params.get("norm_C2", 1.0))
@@ -116,7 +231,7 @@ def metric_arakelov_ref(G: nx.Graph, params: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def metric_green_smooth_family(G: nx.Graph, params: Dict[str, Any]) -> Dict[str, Any]:
+def metric_green_smooth_family(G: LightGraph, params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Placeholder para 'green_smooth_family'.
     Varre epsilon_grid e retorna uma curva simples baseada em propriedades do grafo.
@@ -124,24 +239,29 @@ def metric_green_smooth_family(G: nx.Graph, params: Dict[str, Any]) -> Dict[str,
     eps_grid = params.get("epsilon_grid", [0.01, 0.02, 0.05, 0.1])
     if not isinstance(eps_grid, list):
         eps_grid = [eps_grid]
-    total_c = float(sum(G.edges[e].get("conductance", 1.0) for e in G.edges))
-    total_w = float(sum(G.nodes[v].get("weight", 1.0) for v in G.nodes))
-    rho = float(G.graph.get("rho", 1.0))
+    total_c = float(G.edge_c.sum())
+    total_w = float(G.node_w.sum())
+    rho = float(G.meta.get("rho", 1.0))
     kappa = (total_c + 1.0) / (total_w + 1.0)
-    series = []
+    eps_vals = []
     for eps in eps_grid:
         try:
-            e = float(eps)
+            eps_vals.append(float(eps))
         except Exception:
             continue
-        value = kappa * rho / (e + 1e-9)
-        series.append({"epsilon": e, "value": value})
+    eps_arr = np.asarray(eps_vals, dtype=np.float64)
+    values = kappa * rho / (eps_arr + 1e-9)
+    series = [{"epsilon": e, "value": v} for e, v in zip(eps_arr.tolist(), values.tolist())]
+    if values.size:
+        min_value, max_value = float(values.min()), float(values.max())
+    else:
+        min_value, max_value = None, None
     return {
         "rho": rho,
         "kappa": kappa,
         "series": series,
-        "min_value": min((p["value"] for p in series), default=None),
-        "max_value": max((p["value"] for p in series), default=None),
+        "min_value": min_value,
+        "max_value": max_value,
     }
 
 
@@ -153,11 +273,62 @@ METRIC_IMPLS = {
 }
 
 
-def evaluate_all(selected_metrics: List[str] = None) -> Dict[str, Any]:
+def _run_metric(metric_name: str, params: Dict[str, Any], G: LightGraph) -> Tuple[Any, Any]:
+    """
+    Executa uma métrica registrada sobre um grafo.
+    Função de topo (serializável) para uso em ProcessPoolExecutor.
+    Retorna (resultado, erro) — exatamente um dos dois é None.
+    """
+    try:
+        return METRIC_IMPLS[metric_name](G, params), None
+    except Exception as e:
+        return None, str(e)
+
+
+@functools.lru_cache(maxsize=None)
+def _impl_digest(metric_name: str) -> str:
+    """
+    Hash da implementação de uma métrica: código-fonte da função registrada
+    (ou bytecode, se a fonte não estiver disponível) + METRIC_CACHE_VERSION.
+    """
+    fn = METRIC_IMPLS[metric_name]
+    try:
+        code = inspect.getsource(fn).encode("utf-8")
+    except (OSError, TypeError):
+        code = fn.__code__.co_code
+    h = hashlib.blake2b(code, digest_size=8)
+    h.update(str(METRIC_CACHE_VERSION).encode("ascii"))
+    return h.hexdigest()
+
+
+def _cache_path(metric_name: str, G: LightGraph, params: Dict[str, Any]) -> Optional[Path]:
+    """
+    Caminho do resultado em cache para (hash do grafo, hash dos parâmetros,
+    hash da implementação da métrica): editar a métrica invalida seus resultados.
+    Retorna None se o grafo não tiver hash de origem.
+    """
+    gdigest = G.meta.get("source_digest")
+    if not gdigest:
+        return None
+    return CACHE_DIR / metric_name / f"{gdigest}-{canonical_digest(params)}-{_impl_digest(metric_name)}.json"
+
+
+def evaluate_all(
+    selected_metrics: List[str] = None,
+    max_workers: Optional[int] = 1,
+    use_cache: bool = True,
+    save_formats: Tuple[str, ...] = ("json",),
+) -> Dict[str, Any]:
     """
     Avalia todas as métricas do catálogo em todos os grafos construídos.
     selected_metrics: lista opcional de nomes de métricas a rodar.
-    Retorna um dicionário com resultados e um índice.
+    max_workers: nº de processos para avaliar os pares (métrica, grafo);
+                 1 (padrão) executa em série, None usa os.cpu_count().
+    use_cache: reutiliza resultados em build/metrics/.cache quando nem o
+               arquivo do grafo nem os parâmetros da métrica mudaram.
+    save_formats: formatos das saídas por resultado e do índice; YAML é opcional
+                  (ver scripts/report/emit_yaml_views.py para gerá-lo depois).
+    Retorna um dicionário com resultados, um índice e contadores de cache.
     """
     ensure_dir(RESULTS_DIR)
     graphs = _load_graphs()
@@ -169,55 +340,89 @@ def evaluate_all(selected_metrics: List[str] = None) -> Dict[str, Any]:
         if not catalog:
             raise ValueError(f"Nenhuma métrica correspondente em selected_metrics={selected_metrics}")
 
+    # Pula métricas sem implementação
+    catalog = [m for m in catalog if m.name in METRIC_IMPLS]
+    tasks = [(mcfg, gid, G) for mcfg in catalog for gid, G, meta in graphs]
+    outcomes: List[Tuple[Any, Any]] = [(None, None)] * len(tasks)
+
+    # Consulta o cache; apenas as faltas são avaliadas
+    cache_paths = [_cache_path(mcfg.name, G, mcfg.params) if use_cache else None for mcfg, gid, G in tasks]
+    pending: List[int] = []
+    for k, cpath in enumerate(cache_paths):
+        if cpath is not None and cpath.exists():
+            try:
+                outcomes[k] = (read_json(cpath), None)
+                continue
+            except ValueError:
+                pass  # entrada corrompida: recalcula
+        pending.append(k)
+    cache_stats = {"hits": len(tasks) - len(pending), "misses": len(pending)}
+
+    # Avaliação (paralela se solicitado); a escrita fica no processo principal
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = {
+                ex.submit(_run_metric, tasks[k][0].name, tasks[k][0].params, tasks[k][2]): k
+                for k in pending
+            }
+            for fut in as_completed(futures):
+                outcomes[futures[fut]] = fut.result()
+    else:
+        for k in pending:
+            mcfg, gid, G = tasks[k]
+            outcomes[k] = _run_metric(mcfg.name, mcfg.params, G)
+
+    # Grava no cache os resultados recém-calculados
+    for k in pending:
+        res, err = outcomes[k]
+        if err is None and cache_paths[k] is not None:
+            write_json(cache_paths[k], res, indent=None)
+
     results_index: List[Dict[str, Any]] = []
 
-    for mcfg in catalog:
-        impl = METRIC_IMPLS.get(mcfg.name)
-        if impl is None:
-            # Pula métricas sem implementação
-            continue
+    for (mcfg, gid, G), (res, err) in zip(tasks, outcomes):
         metric_dir = ensure_dir(RESULTS_DIR / mcfg.name)
-        for gid, G, meta in graphs:
-            try:
-                res = impl(G, mcfg.params)
-                payload = {
-                    "graph_id": gid,
-                    "graph_meta": {
-                        "class": G.graph.get("class"),
-                        "n": G.graph.get("n"),
-                        "rho": G.graph.get("rho"),
-                    },
-                    "metric": {
-                        "name": mcfg.name,
-                        "description": mcfg.description,
-                        "params": mcfg.params,
-                        "assumptions": mcfg.assumptions,
-                    },
-                    "result": res,
-                }
-                # salva por grafo
-                base = metric_dir / f"{gid}"
-                write_json(str(base) + ".json", payload, indent=2)
-                write_yaml(str(base) + ".yaml", payload)
-                results_index.append({
-                    "metric": mcfg.name,
-                    "graph_id": gid,
-                    "path_json": str(base) + ".json",
-                    "path_yaml": str(base) + ".yaml",
-                })
-            except Exception as e:
-                err_payload = {
-                    "graph_id": gid,
-                    "metric": mcfg.name,
-                    "error": str(e),
-                }
-                write_json(metric_dir / f"{gid}.error.json", err_payload, indent=2)
+        try:
+            if err is not None:
+                raise RuntimeError(err)
+            payload = {
+                "graph_id": gid,
+                "graph_meta": {
+                    "class": G.meta.get("class"),
+                    "n": G.meta.get("n"),
+                    "rho": G.meta.get("rho"),
+                },
+                "metric": {
+                    "name": mcfg.name,
+                    "description": mcfg.description,
+                    "params": mcfg.params,
+                    "assumptions": mcfg.assumptions,
+                },
+                "result": res,
+            }
+            # salva por grafo
+            paths = write_payload(metric_dir / f"{gid}", payload, save_formats)
+            results_index.append({
+                "metric": mcfg.name,
+                "graph_id": gid,
+                "path_json": paths["json"],
+                "path_yaml": paths["yaml"],
+            })
+        except Exception as e:
+            err_payload = {
+                "graph_id": gid,
+                "metric": mcfg.name,
+                "error": str(e),
+            }
+            write_json(metric_dir / f"{gid}.error.json", err_payload, indent=2)
 
     # Salva índice geral
     write_json(RESULTS_DIR / "index.json", {"results": results_index}, indent=2)
-    write_yaml(RESULTS_DIR / "index.yaml", {"results": results_index})
+    if "yaml" in save_formats:
+        write_yaml_index(RESULTS_DIR / "index.yaml", {"results": results_index})
 
-    return {"results": results_index}
+    return {"results": results_index, "cache": cache_stats}
 
 
 if __name__ == "__main__":
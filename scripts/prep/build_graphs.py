@@ -1,11 +1,15 @@
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 
 import networkx as nx
+import numpy as np
 import yaml
 
-from scripts.common.io_utils import read_yaml, ensure_dir, write_json, write_yaml
+from scripts.common.io_utils import read_structured, ensure_dir, write_yaml_index, write_payload, stream_json_list
 
 DATA_DIR = Path("tesa-machine/data")
 TYPES_PATH = DATA_DIR / "types" / "En_Dn_library.yaml"
@@ -27,12 +31,20 @@ class GraphSpec:
 
 def _load_types() -> List[GraphSpec]:
     """
-    Carrega os tipos E_n/D_n do YAML e normaliza em GraphSpec.
+    Carrega os tipos E_n/D_n do YAML e normaliza em GraphSpec
+    (memoizado por caminho e mtime do arquivo).
     """
     if not TYPES_PATH.exists():
         raise FileNotFoundError(f"Arquivo de tipos não encontrado: {TYPES_PATH}")
+    return list(_parse_types(str(TYPES_PATH), TYPES_PATH.stat().st_mtime_ns))
 
-    data = read_yaml(TYPES_PATH)
+
+@functools.lru_cache(maxsize=None)
+def _parse_types(types_path: str, mtime_ns: int) -> Tuple[GraphSpec, ...]:
+    """
+    Lê e normaliza os tipos; mtime_ns invalida a entrada quando o arquivo muda.
+    """
+    data = read_structured(types_path)
     if not isinstance(data, dict) or "types" not in data:
         raise ValueError("Formato inválido em En_Dn_library.yaml: chave 'types' ausente")
 
@@ -52,7 +64,7 @@ def _load_types() -> List[GraphSpec]:
         except (KeyError, TypeError, ValueError) as e:
             raise ValueError(f"Tipo inválido em 'types': {t!r} -> {e}")
         specs.append(spec)
-    return specs
+    return tuple(specs)
 
 
 def _build_nx_graph(spec: GraphSpec) -> nx.Graph:
@@ -62,18 +74,18 @@ def _build_nx_graph(spec: GraphSpec) -> nx.Graph:
     - Atributos de aresta: conductance (float)
     - Atributo de grafo: rho (float), class (str), id (str), n (int)
     """
+    # Pré-validação única: toda aresta deve referir vértices declarados
+    vset = set(spec.vertices)
+    bad = next((e for e in spec.edges if e.get("u") not in vset or e.get("v") not in vset), None)
+    if bad is not None:
+        raise ValueError(f"Aresta refere nó inexistente: {bad!r}")
+
     G = nx.Graph()
-    # Nós
-    for v in spec.vertices:
-        w = float(spec.weights.get(v, 1.0))
-        G.add_node(v, weight=w)
-    # Arestas
-    for e in spec.edges:
-        u, v = e.get("u"), e.get("v")
-        if u not in G or v not in G:
-            raise ValueError(f"Aresta refere nó inexistente: {e!r}")
-        c = float(e.get("conductance", 1.0))
-        G.add_edge(u, v, conductance=c)
+    # Nós e arestas via construtores em lote
+    G.add_nodes_from((v, {"weight": float(spec.weights.get(v, 1.0))}) for v in spec.vertices)
+    G.add_edges_from(
+        (e["u"], e["v"], {"conductance": float(e.get("conductance", 1.0))}) for e in spec.edges
+    )
     # Atributos globais
     G.graph["rho"] = spec.rho
     G.graph["class"] = spec.cls
@@ -90,9 +102,13 @@ def _graph_summary(G: nx.Graph) -> Dict[str, Any]:
     Produz um sumário leve do grafo para inspeção/depuração.
     """
     m = G.number_of_edges()
-    degrees = {v: int(d) for v, d in G.degree()}
-    total_weight = float(sum(G.nodes[v].get("weight", 0.0) for v in G.nodes))
-    total_conductance = float(sum(G.edges[e].get("conductance", 0.0) for e in G.edges))
+    nodes = list(G.nodes)
+    deg = np.fromiter((d for _, d in G.degree(nodes)), dtype=np.int64, count=len(nodes))
+    degrees = dict(zip(nodes, deg.tolist()))
+    w = np.fromiter((x for _, x in G.nodes(data="weight", default=0.0)), dtype=np.float64, count=len(nodes))
+    c = np.fromiter((x for _, _, x in G.edges(data="conductance", default=0.0)), dtype=np.float64, count=m)
+    total_weight = float(np.add.reduce(w))
+    total_conductance = float(np.add.reduce(c))
     return {
         "id": G.graph.get("id"),
         "class": G.graph.get("class"),
@@ -105,44 +121,63 @@ def _graph_summary(G: nx.Graph) -> Dict[str, Any]:
     }
 
 
-def build_all(save_formats: Tuple[str, ...] = ("json", "yaml")) -> List[Dict[str, Any]]:
+def _build_and_dump(spec: GraphSpec, save_formats: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Constrói o grafo de um GraphSpec, grava suas serializações e retorna o sumário.
+    Função de topo (serializável) para uso em ProcessPoolExecutor.
+    """
+    G = _build_nx_graph(spec)
+
+    # Serializações leves: nós e arestas com atributos
+    serial = {
+        "graph": {
+            "id": G.graph.get("id"),
+            "class": G.graph.get("class"),
+            "n": G.graph.get("n"),
+            "rho": G.graph.get("rho"),
+            "metadata": spec.metadata,
+        },
+        "nodes": [{"id": v, **G.nodes[v]} for v in G.nodes],
+        "edges": [{"u": u, "v": v, **G.edges[u, v]} for u, v in G.edges],
+    }
+
+    write_payload(GRAPHS_DIR / spec.id, serial, save_formats)
+    return _graph_summary(G)
+
+
+def build_all(
+    save_formats: Tuple[str, ...] = ("json",),
+    max_workers: Optional[int] = 1,
+) -> List[Dict[str, Any]]:
     """
     Constrói todos os grafos definidos em En_Dn_library.yaml e salva
     em tesa-machine/build/graphs/<id>.json|yaml, além de retornar um
-    índice com resumos.
+    índice com resumos. YAML só é gravado se "yaml" estiver em save_formats.
+    max_workers: nº de processos para construir/serializar os grafos;
+                 1 (padrão) executa em série, None usa min(8, os.cpu_count()).
     """
     specs = _load_types()
     ensure_dir(GRAPHS_DIR)
 
     index: List[Dict[str, Any]] = []
-
-    for spec in specs:
-        G = _build_nx_graph(spec)
-        summary = _graph_summary(G)
-        index.append(summary)
-
-        # Serializações leves: nós e arestas com atributos
-        serial = {
-            "graph": {
-                "id": G.graph.get("id"),
-                "class": G.graph.get("class"),
-                "n": G.graph.get("n"),
-                "rho": G.graph.get("rho"),
-                "metadata": spec.metadata,
-            },
-            "nodes": [{"id": v, **G.nodes[v]} for v in G.nodes],
-            "edges": [{"u": u, "v": v, **G.edges[u, v]} for u, v in G.edges],
-        }
-
-        base = GRAPHS_DIR / spec.id
-        if "json" in save_formats:
-            write_json(str(base) + ".json", serial, indent=2)
-        if "yaml" in save_formats:
-            write_yaml(str(base) + ".yaml", serial)
-
-    # Salva índice
-    write_json(GRAPHS_DIR / "index.json", {"graphs": index}, indent=2)
-    write_yaml(GRAPHS_DIR / "index.yaml", {"graphs": index})
+    workers = max_workers if max_workers is not None else min(8, os.cpu_count() or 1)
+
+    # O índice JSON é emitido em fluxo, à medida que cada grafo é construído
+    with stream_json_list(GRAPHS_DIR / "index.json", "graphs") as emit_summary:
+        if workers > 1 and len(specs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                summaries = ex.map(_build_and_dump, specs, [save_formats] * len(specs))
+                for summary in summaries:
+                    emit_summary(summary)
+                    index.append(summary)
+        else:
+            for spec in specs:
+                summary = _build_and_dump(spec, save_formats)
+                emit_summary(summary)
+                index.append(summary)
+
+    if "yaml" in save_formats:
+        write_yaml_index(GRAPHS_DIR / "index.yaml", {"graphs": index})
     return index
 
 
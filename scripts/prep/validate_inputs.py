@@ -1,73 +1,140 @@
+import functools
 import json
 from pathlib import Path
 
 import yaml
 from jsonschema import Draft7Validator, exceptions as jsonschema_exceptions
 
-from scripts.common.io_utils import read_json, read_yaml, list_files
+# fastjsonschema é opcional: compila o schema em código Python para checagem rápida.
+try:
+    import fastjsonschema
+except ImportError:  # pragma: no cover - dependência opcional
+    fastjsonschema = None
+
+from scripts.common.io_utils import read_structured, list_files
 
 
 SCHEMAS_DIR = Path("tesa-machine/schemas")
 DATA_DIR = Path("tesa-machine/data")
 
+# Validadores compilados por schema: id(schema) -> (schema, Draft7Validator, fast_check|None)
+_VALIDATORS = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _read_schema(schema_path: str, mtime_ns: int):
+    """
+    Lê e memoiza um schema; mtime_ns invalida a entrada quando o arquivo muda.
+    """
+    try:
+        return read_structured(schema_path)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Schema inválido ({schema_path}): {e}")
+
 
 def _load_schema(schema_name: str):
     """
-    Carrega um schema JSON do diretório de schemas.
+    Carrega um schema JSON do diretório de schemas (memoizado por caminho e mtime).
     """
     schema_path = SCHEMAS_DIR / schema_name
     if not schema_path.exists():
         raise FileNotFoundError(f"Schema não encontrado: {schema_path}")
-    try:
-        return read_json(schema_path)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Schema inválido ({schema_path}): {e}")
+    return _read_schema(str(schema_path), schema_path.stat().st_mtime_ns)
+
+
+def _get_validators(schema):
+    """
+    Retorna (Draft7Validator, fast_check) compilados uma única vez por schema.
+    fast_check é None quando fastjsonschema não está disponível.
+    """
+    cached = _VALIDATORS.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1], cached[2]
+    validator = Draft7Validator(schema)
+    fast_check = None
+    if fastjsonschema is not None:
+        try:
+            fast_check = fastjsonschema.compile(schema)
+        except Exception:
+            fast_check = None  # schema fora do suporte do fastjsonschema
+    _VALIDATORS[id(schema)] = (schema, validator, fast_check)
+    return validator, fast_check
 
 
 def _validate_with_schema(instance, schema, context_label=""):
     """
     Valida um objeto contra um schema JSON. Retorna lista de erros (strings).
     """
-    validator = Draft7Validator(schema)
+    validator, fast_check = _get_validators(schema)
+    if fast_check is not None:
+        try:
+            fast_check(instance)
+            return []
+        except fastjsonschema.JsonSchemaException:
+            pass  # há erros: coleta a lista completa com o jsonschema
+    raw_errors = list(validator.iter_errors(instance))
+    if not raw_errors:
+        return []
     errors = []
-    for error in sorted(validator.iter_errors(instance), key=lambda e: e.path):
+    for error in sorted(raw_errors, key=lambda e: e.path):
         loc = ".".join([str(p) for p in error.path]) if error.path else "(root)"
         errors.append(f"[{context_label}] {loc}: {error.message}")
     return errors
 
 
+@functools.lru_cache(maxsize=None)
+def _validate_file(data_path: str, data_mtime_ns: int, schema_name: str, schema_mtime_ns: int, context_label: str):
+    """
+    Valida um arquivo de dados contra um schema e memoiza a lista de erros.
+    A chave inclui os mtimes de ambos: entradas inalteradas não são revalidadas.
+    """
+    schema = _load_schema(schema_name)
+    data = read_structured(data_path)
+    return tuple(_validate_with_schema(data, schema, context_label=context_label))
+
+
+def _schema_mtime_ns(schema_name: str) -> int:
+    """
+    mtime do schema (0 se ausente; _load_schema reporta o erro).
+    """
+    schema_path = SCHEMAS_DIR / schema_name
+    return schema_path.stat().st_mtime_ns if schema_path.exists() else 0
+
+
 def validate_types():
     """
     Valida o arquivo YAML de tipos (E_n/D_n) contra o schema correspondente.
     """
-    schema = _load_schema("type_schema.json")
+    _load_schema("type_schema.json")
     types_path = DATA_DIR / "types" / "En_Dn_library.yaml"
     if not types_path.exists():
         raise FileNotFoundError(f"Arquivo de tipos não encontrado: {types_path}")
     try:
-        types_data = read_yaml(types_path)
+        errors = _validate_file(
+            str(types_path), types_path.stat().st_mtime_ns,
+            "type_schema.json", _schema_mtime_ns("type_schema.json"), "types",
+        )
     except yaml.YAMLError as e:
         raise ValueError(f"YAML de tipos inválido ({types_path}): {e}")
-
-    errors = _validate_with_schema(types_data, schema, context_label="types")
-    return errors
+    return list(errors)
 
 
 def validate_metrics():
     """
     Valida o catálogo de métricas contra o schema correspondente.
     """
-    schema = _load_schema("metric_schema.json")
+    _load_schema("metric_schema.json")
     metrics_path = DATA_DIR / "metrics" / "metrics_catalog.yaml"
     if not metrics_path.exists():
         raise FileNotFoundError(f"Arquivo de métricas não encontrado: {metrics_path}")
     try:
-        metrics_data = read_yaml(metrics_path)
+        errors = _validate_file(
+            str(metrics_path), metrics_path.stat().st_mtime_ns,
+            "metric_schema.json", _schema_mtime_ns("metric_schema.json"), "metrics",
+        )
     except yaml.YAMLError as e:
         raise ValueError(f"YAML de métricas inválido ({metrics_path}): {e}")
-
-    errors = _validate_with_schema(metrics_data, schema, context_label="metrics")
-    return errors
+    return list(errors)
 
 
 def validate_all():
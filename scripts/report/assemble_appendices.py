@@ -1,13 +1,11 @@
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import json
-import yaml
-
 from scripts.common.io_utils import (
-    read_json,
-    read_yaml,
+    read_structured,
     ensure_dir,
+    write_json,
+    write_yaml_index,
 )
 
 RESULTS_DIR = Path("tesa-machine/results")
@@ -18,12 +16,18 @@ APPENDICES_DIR = REPORTS_DIR / "appendices"
 
 def _safe_read(path: Path) -> Optional[Dict[str, Any] | List[Any]]:
     try:
-        if path.suffix.lower() == ".json":
-            return read_json(path)
-        elif path.suffix.lower() in (".yml", ".yaml"):
-            return read_yaml(path)
+        return read_structured(path)
     except Exception:
         return None
+
+def _read_first(*paths: Path) -> Optional[Dict[str, Any] | List[Any]]:
+    # Lê o primeiro caminho existente (stat barato antes de abrir); só passa
+    # ao próximo se o arquivo faltar ou não puder ser lido.
+    for path in paths:
+        if path.is_file():
+            data = _safe_read(path)
+            if data is not None:
+                return data
     return None
 
 def _gather_spectrum_material() -> Dict[str, Any]:
@@ -34,8 +38,14 @@ def _gather_spectrum_material() -> Dict[str, Any]:
     sum_json = RESULTS_DIR / "spectrum" / "summary_spectrum.json"
     sum_yaml = RESULTS_DIR / "spectrum" / "summary_spectrum.yaml"
 
-    out["index"] = _safe_read(idx_json) or _safe_read(idx_yaml)
-    summary = _safe_read(sum_json) or _safe_read(sum_yaml)
+    out["index"] = _read_first(idx_json, idx_yaml)
+    summary = _read_first(sum_json, sum_yaml)
+
+    # lookup do summary por graph_id (primeira ocorrência prevalece)
+    summary_by_id: Dict[Any, Dict[str, Any]] = {}
+    if summary and isinstance(summary, dict):
+        for srec in summary.get("results", []):
+            summary_by_id.setdefault(srec.get("graph_id"), srec)
 
     # itens por grafo a partir do índice de plots
     items: List[Dict[str, Any]] = []
@@ -45,11 +55,9 @@ def _gather_spectrum_material() -> Dict[str, Any]:
             paths = rec.get("paths", {})
             stats = rec.get("stats", {})
             # juntar com lambda1 do summary, se disponível
-            if summary and isinstance(summary, dict):
-                for srec in summary.get("results", []):
-                    if srec.get("graph_id") == gid:
-                        stats = {**srec, **stats}
-                        break
+            srec = summary_by_id.get(gid)
+            if srec is not None:
+                stats = {**srec, **stats}
             items.append({
                 "graph_id": gid,
                 "paths": {
@@ -68,7 +76,7 @@ def _gather_tables() -> Dict[str, Any]:
     summary_yaml = TABLES_DIR / "summary_tables.yaml"
     csv_path = TABLES_DIR / "summary_tables.csv"
 
-    data = _safe_read(summary_json) or _safe_read(summary_yaml) or {"results": []}
+    data = _read_first(summary_json, summary_yaml) or {"results": []}
     return {
         "summary": data,
         "csv_path": str(csv_path) if csv_path.exists() else None,
@@ -80,8 +88,8 @@ def _gather_physics_indexes() -> Dict[str, Any]:
     fen_json = RESULTS_DIR / "physics" / "fenchel_energy_index.json"
     fen_yaml = RESULTS_DIR / "physics" / "fenchel_energy_index.yaml"
 
-    eff = _safe_read(eff_json) or _safe_read(eff_yaml) or {"results": []}
-    fen = _safe_read(fen_json) or _safe_read(fen_yaml) or {"results": []}
+    eff = _read_first(eff_json, eff_yaml) or {"results": []}
+    fen = _read_first(fen_json, fen_yaml) or {"results": []}
     return {"effective_resistance": eff, "fenchel_energy": fen}
 
 def assemble_appendices(limit_ids: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -118,10 +126,8 @@ def assemble_appendices(limit_ids: Optional[List[str]] = None) -> Dict[str, Any]
     out_json = out_dir / "appendices_index.json"
     out_yaml = out_dir / "appendices_index.yaml"
 
-    with open(out_json, "w", encoding="utf-8") as f:
-        json.dump(appendix, f, indent=2, ensure_ascii=False)
-    with open(out_yaml, "w", encoding="utf-8") as f:
-        yaml.safe_dump(appendix, f, sort_keys=False, allow_unicode=True)
+    write_json(out_json, appendix, indent=2)
+    write_yaml_index(out_yaml, appendix)
 
     return appendix
 
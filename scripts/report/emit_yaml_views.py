@@ -0,0 +1,39 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from scripts.common.io_utils import read_json, write_yaml
+
+BUILD_DIR = Path("tesa-machine/build")
+RESULTS_DIR = Path("tesa-machine/results")
+DEFAULT_ROOTS = (BUILD_DIR / "graphs", BUILD_DIR / "metrics", RESULTS_DIR)
+
+def _is_stale(src: Path, dst: Path) -> bool:
+    if not dst.exists():
+        return True
+    return dst.stat().st_mtime_ns < src.stat().st_mtime_ns
+
+def emit_yaml_views(roots: Optional[Sequence[Path | str]] = None, force: bool = False) -> Dict[str, Any]:
+    # Gera, sob demanda, a visão YAML de cada JSON (mesmo nome, extensão .yaml).
+    # Só regrava quando o YAML não existe ou é mais antigo que o JSON, salvo force=True.
+    # Diretórios ocultos (ex.: .cache) e arquivos *.error.json são ignorados.
+    roots = [Path(r) for r in (roots or DEFAULT_ROOTS)]
+    written: List[str] = []
+    skipped = 0
+    for root in roots:
+        if not root.exists():
+            continue
+        for src in sorted(root.rglob("*.json")):
+            rel_parts = src.relative_to(root).parts
+            if any(part.startswith(".") for part in rel_parts) or src.name.endswith(".error.json"):
+                continue
+            dst = src.with_suffix(".yaml")
+            if not force and not _is_stale(src, dst):
+                skipped += 1
+                continue
+            write_yaml(dst, read_json(src))
+            written.append(str(dst))
+    return {"written": written, "skipped": skipped}
+
+if __name__ == "__main__":
+    out = emit_yaml_views()
+    print(f"Visões YAML geradas: {len(out['written'])}; já atualizadas: {out['skipped']}.")
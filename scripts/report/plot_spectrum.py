@@ -1,15 +1,44 @@
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import json
-import yaml
+import os
 import numpy as np
-import matplotlib.pyplot as plt
 
-from scripts.common.io_utils import read_json, read_yaml, ensure_dir
+from scripts.common.io_utils import read_json, read_yaml, ensure_dir, write_json, write_yaml_index
 
 RESULTS_SPECTRUM_DIR = Path("tesa-machine/results") / "spectrum"
 PLOTS_DIR = Path("tesa-machine/reports") / "plots"
+# resolução dos PNGs (100 dpi basta para visualização inline; ajustável por ambiente)
+PLOT_DPI = int(os.environ.get("TESA_PLOT_DPI", "100"))
+
+# Figura/eixos reutilizados entre todos os gráficos (criados sob demanda).
+# matplotlib só é importado aqui, no primeiro desenho: carregar/filtrar espectros
+# (_load_all_spectra) não paga o custo de importação.
+_FIG = None
+_AX = None
+
+def _get_axes():
+    # Retorna (fig, ax) compartilhados, com os eixos limpos para um novo desenho.
+    global _FIG, _AX
+    if _FIG is None:
+        import matplotlib
+        matplotlib.use("Agg")  # sem backend interativo: apenas gravação de PNG
+        import matplotlib.pyplot as plt
+        # linhas longas (espectros grandes) são desenhadas em blocos pelo Agg
+        plt.rcParams["agg.path.chunksize"] = 10000
+        _FIG, _AX = plt.subplots(figsize=(7, 4))
+    _AX.cla()
+    return _FIG, _AX
+
+def _equal_width_histogram(values: np.ndarray, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Histograma de bins de mesma largura por reescala + bincount (sem busca de bordas).
+    # Mesmo intervalo que np.histogram: [min, max], ou min ± 0.5 se todos os valores coincidem.
+    lo, hi = float(values.min()), float(values.max())
+    if hi <= lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    idx = np.minimum(((values - lo) * (bins / (hi - lo))).astype(np.int64), bins - 1)
+    counts = np.bincount(idx, minlength=bins)
+    return counts, np.linspace(lo, hi, bins + 1)
 
 def _load_spectrum_entry(path: Path) -> Optional[Dict[str, Any]]:
     try:
@@ -51,49 +80,48 @@ def _plot_eigenvalues(gid: str, eigvals: List[float], out_dir: Path) -> Dict[str
     arr_sorted = np.sort(arr)
 
     # Plot 1: linha dos autovalores (espectro ordenado)
-    plt.figure(figsize=(7, 4))
-    plt.plot(np.arange(1, len(arr_sorted) + 1), arr_sorted, marker="o", linestyle="-", linewidth=1)
-    plt.xlabel("índice k")
-    plt.ylabel("autovalor λ_k")
-    plt.title(f"Espectro do Laplaciano — {gid}")
-    plt.grid(True, alpha=0.3)
+    fig, ax = _get_axes()
+    ax.plot(np.arange(1, len(arr_sorted) + 1), arr_sorted, marker="o", linestyle="-", linewidth=1)
+    ax.set_xlabel("índice k")
+    ax.set_ylabel("autovalor λ_k")
+    ax.set_title(f"Espectro do Laplaciano — {gid}")
+    ax.grid(True, alpha=0.3)
     f1 = out_dir / f"{gid}_spectrum.png"
-    plt.tight_layout()
-    plt.savefig(f1, dpi=150)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(f1, dpi=PLOT_DPI)
 
     # Plot 2: histograma de autovalores (exclui zero se presente)
     eps = 1e-14
     arr_pos = arr_sorted[arr_sorted > eps]
-    plt.figure(figsize=(7, 4))
+    fig, ax = _get_axes()
     if len(arr_pos) > 0:
-        plt.hist(arr_pos, bins=min(50, max(10, len(arr_pos) // 5)), color="#4e79a7", alpha=0.85, edgecolor="black")
+        counts, bin_edges = _equal_width_histogram(arr_pos, min(50, max(10, len(arr_pos) // 5)))
+        ax.bar(bin_edges[:-1], counts, width=np.diff(bin_edges), align="edge",
+               color="#4e79a7", alpha=0.85, edgecolor="black", rasterized=True)
     else:
         # gráfico vazio com aviso
-        plt.text(0.5, 0.5, "Sem autovalores positivos informados", ha="center", va="center", transform=plt.gca().transAxes)
-    plt.xlabel("autovalor λ")
-    plt.ylabel("contagem")
-    plt.title(f"Histograma do espectro — {gid}")
-    plt.grid(True, alpha=0.3)
+        ax.text(0.5, 0.5, "Sem autovalores positivos informados", ha="center", va="center", transform=ax.transAxes)
+    ax.set_xlabel("autovalor λ")
+    ax.set_ylabel("contagem")
+    ax.set_title(f"Histograma do espectro — {gid}")
+    ax.grid(True, alpha=0.3)
     f2 = out_dir / f"{gid}_spectrum_hist.png"
-    plt.tight_layout()
-    plt.savefig(f2, dpi=150)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(f2, dpi=PLOT_DPI)
 
     # Plot 3: razão espectral local λ_{k+1}/λ_k (para k >= 1)
     ratios = None
     if len(arr_pos) >= 2:
         ratios = arr_pos[1:] / np.maximum(arr_pos[:-1], eps)
-        plt.figure(figsize=(7, 4))
-        plt.plot(np.arange(1, len(ratios) + 1), ratios, marker="o", linestyle="-", linewidth=1, color="#f28e2b")
-        plt.xlabel("k")
-        plt.ylabel("λ_{k+1} / λ_k")
-        plt.title(f"Razão espectral — {gid}")
-        plt.grid(True, alpha=0.3)
+        fig, ax = _get_axes()
+        ax.plot(np.arange(1, len(ratios) + 1), ratios, marker="o", linestyle="-", linewidth=1, color="#f28e2b")
+        ax.set_xlabel("k")
+        ax.set_ylabel("λ_{k+1} / λ_k")
+        ax.set_title(f"Razão espectral — {gid}")
+        ax.grid(True, alpha=0.3)
         f3 = out_dir / f"{gid}_spectral_ratio.png"
-        plt.tight_layout()
-        plt.savefig(f3, dpi=150)
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(f3, dpi=PLOT_DPI)
     else:
         f3 = None
 
@@ -113,7 +141,7 @@ def _plot_eigenvalues(gid: str, eigvals: List[float], out_dir: Path) -> Dict[str
         }
     }
 
-def plot_all_spectra(limit_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+def plot_all_spectra(limit_ids: Optional[List[str]] = None, save_formats: Tuple[str, ...] = ("json",)) -> Dict[str, Any]:
     ensure_dir(PLOTS_DIR)
     entries = _load_all_spectra()
     if limit_ids:
@@ -133,10 +161,9 @@ def plot_all_spectra(limit_ids: Optional[List[str]] = None) -> Dict[str, Any]:
     index_path_json = PLOTS_DIR / "spectrum_plots_index.json"
     index_path_yaml = PLOTS_DIR / "spectrum_plots_index.yaml"
 
-    with open(index_path_json, "w", encoding="utf-8") as f:
-        json.dump({"results": results}, f, indent=2, ensure_ascii=False)
-    with open(index_path_yaml, "w", encoding="utf-8") as f:
-        yaml.safe_dump({"results": results}, f, sort_keys=False, allow_unicode=True)
+    write_json(index_path_json, {"results": results}, indent=2)
+    if "yaml" in save_formats:
+        write_yaml_index(index_path_yaml, {"results": results})
 
     return {"results": results}
 
@@ -3,7 +3,7 @@ from typing import Any, Dict, List
 
 import csv
 
-from scripts.common.io_utils import read_json, read_yaml, ensure_dir, write_json, write_yaml
+from scripts.common.io_utils import read_json, read_yaml, ensure_dir, write_json, write_yaml_index
 
 RESULTS_SPECTRUM_DIR = Path("tesa-machine/results") / "spectrum"
 RESULTS_PHYSICS_DIR = Path("tesa-machine/results") / "physics"
@@ -46,10 +46,15 @@ def _collect_effective_resistance_stats() -> List[Dict[str, Any]]:
     index = _load_effective_resistance_index()
     out: List[Dict[str, Any]] = []
     for entry in index:
-        p = Path(entry.get("path_json", ""))
-        if not p.exists():
-            continue
-        data = read_json(p)
+        if "stats" in entry:
+            # índice já traz as estatísticas: não relê o JSON por grafo
+            data = entry
+        else:
+            # índices antigos: recorre ao arquivo por grafo
+            p = Path(entry.get("path_json", ""))
+            if not p.exists():
+                continue
+            data = read_json(p)
         stats = data.get("stats", {})
         out.append({
             "graph_id": data.get("graph_id"),
@@ -96,40 +101,7 @@ def build_tables() -> Dict[str, Any]:
     # União de ids
     ids = sorted(set(spec_by_id.keys()) | set(eff_by_id.keys()) | set(fen_by_id.keys()))
 
-    # Tabela CSV consolidada
-    csv_path = REPORTS_DIR / "summary_tables.csv"
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow([
-            "graph_id",
-            "n",
-            "rho",
-            "lambda1",
-            "k_used",
-            "effective_resistance_min",
-            "effective_resistance_max",
-            "effective_resistance_mean",
-            "effective_resistance_median",
-            "fenchel_energy",
-        ])
-        for gid in ids:
-            s = spec_by_id.get(gid, {})
-            e = eff_by_id.get(gid, {})
-            fe = fen_by_id.get(gid, {})
-            w.writerow([
-                gid,
-                s.get("n") or e.get("n") or fe.get("n"),
-                s.get("rho") or e.get("rho") or fe.get("rho"),
-                s.get("lambda1"),
-                s.get("k_used"),
-                e.get("effective_resistance_min"),
-                e.get("effective_resistance_max"),
-                e.get("effective_resistance_mean"),
-                e.get("effective_resistance_median"),
-                fe.get("fenchel_energy"),
-            ])
-
-    # Também salvar em JSON e YAML
+    # Junção única por graph_id: os registros alimentam JSON/YAML e o CSV
     records: List[Dict[str, Any]] = []
     for gid in ids:
         s = spec_by_id.get(gid, {})
@@ -154,8 +126,40 @@ def build_tables() -> Dict[str, Any]:
             "fenchel_energy": fe.get("fenchel_energy"),
         })
 
+    # Tabela CSV consolidada (linhas derivadas dos registros, escritas em lote)
+    csv_path = REPORTS_DIR / "summary_tables.csv"
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow([
+            "graph_id",
+            "n",
+            "rho",
+            "lambda1",
+            "k_used",
+            "effective_resistance_min",
+            "effective_resistance_max",
+            "effective_resistance_mean",
+            "effective_resistance_median",
+            "fenchel_energy",
+        ])
+        w.writerows(
+            (
+                r["graph_id"],
+                r["n"],
+                r["rho"],
+                r["spectrum"]["lambda1"],
+                r["spectrum"]["k_used"],
+                r["effective_resistance"]["min"],
+                r["effective_resistance"]["max"],
+                r["effective_resistance"]["mean"],
+                r["effective_resistance"]["median"],
+                r["fenchel_energy"],
+            )
+            for r in records
+        )
+
     write_json(REPORTS_DIR / "summary_tables.json", {"results": records}, indent=2)
-    write_yaml(REPORTS_DIR / "summary_tables.yaml", {"results": records})
+    write_yaml_index(REPORTS_DIR / "summary_tables.yaml", {"results": records})
 
     return {"results": records}
 
@@ -4,6 +4,8 @@ from typing import Any, Dict, List
 import json
 import math
 
+import numpy as np
+
 from scripts.common.io_utils import read_json, read_yaml, ensure_dir, write_json, write_yaml
 
 RESULTS_DIR = Path("tesa-machine/results") / "spectrum"
@@ -41,15 +43,15 @@ def _heuristic_convergence_check(entry: Dict[str, Any]) -> Dict[str, Any]:
 
     if lambdas and isinstance(lambdas, list):
         try:
-            lambdas_f = [float(x) for x in lambdas]
-            if any(x <= 0 for x in lambdas_f):
+            arr = np.asarray(lambdas, dtype=np.float64)
+            if (arr <= 0).any():
                 ok = False
                 reasons.append("algum autovalor não é positivo")
-            if any(lambdas_f[i] > lambdas_f[i + 1] for i in range(len(lambdas_f) - 1)):
+            if (np.diff(arr) < 0).any():
                 ok = False
                 reasons.append("autovalores fora de ordem não-decrescente")
             # coerência com lambda1
-            if lam1 is not None and len(lambdas_f) > 0 and abs(lam1 - lambdas_f[0]) > 1e-8:
+            if lam1 is not None and arr.size > 0 and abs(lam1 - arr[0]) > 1e-8:
                 reasons.append("lambda1 difere do primeiro de 'lambdas' (pode ser numérico)")
         except Exception:
             reasons.append("lista de 'lambdas' inválida")
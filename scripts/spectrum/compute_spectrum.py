@@ -1,12 +1,16 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import json
+import os
 import numpy as np
 import scipy.sparse as sp
+import scipy.sparse.csgraph as csgraph
 import scipy.sparse.linalg as spla
 
-from scripts.common.io_utils import read_json, read_yaml, ensure_dir, write_json, write_yaml
+from scripts.common.io_utils import read_structured, ensure_dir, list_structured_files, write_json, write_yaml_index
 
 BUILD_DIR = Path("tesa-machine/build")
 GRAPHS_DIR = BUILD_DIR / "graphs"
@@ -14,70 +18,113 @@ OPERATORS_DIR = BUILD_DIR / "operators"
 RESULTS_DIR = Path("tesa-machine/results") / "spectrum"
 
 def _load_graph_serial(path: Path) -> Dict[str, Any]:
-    if path.suffix.lower() == ".json":
-        return read_json(path)
-    elif path.suffix.lower() in (".yml", ".yaml"):
-        return read_yaml(path)
-    else:
-        raise ValueError(f"Formato não suportado: {path}")
+    # JSON via orjson; YAML pequeno via espelho JSON em cache (ValueError para outros formatos)
+    return read_structured(path)
 
 def _serial_to_laplacian(data: Dict[str, Any]) -> Tuple[sp.csr_matrix, np.ndarray, Dict[str, Any], List[str]]:
     # nós e índice
     nodes = [nrec["id"] for nrec in data.get("nodes", [])]
     idx = {v: i for i, v in enumerate(nodes)}
     n = len(nodes)
-    # pesos
-    w = np.array([float(next((nr.get("weight", 1.0) for nr in data["nodes"] if nr["id"] == v), 1.0)) for v in nodes], dtype=float)
-    # arestas
-    L = sp.lil_matrix((n, n), dtype=float)
-    for erec in data.get("edges", []):
-        u, v = erec["u"], erec["v"]
-        c = float(erec.get("conductance", 1.0))
-        i, j = idx[u], idx[v]
-        L[i, i] += c
-        L[j, j] += c
-        L[i, j] -= c
-        L[j, i] -= c
-    L = L.tocsr()
+    # pesos: mesma ordem de 'nodes', lidos direto dos registros (sem busca por id)
+    w = np.fromiter((float(nr.get("weight", 1.0)) for nr in data.get("nodes", [])), dtype=np.float64, count=n)
+    # arestas: triplets COO; duplicatas são somadas na conversão para CSR
+    edges = data.get("edges", [])
+    m = len(edges)
+    # extremos numa única passada (pares u, v intercalados); índices int32 como no CSR
+    ends = np.fromiter(
+        chain.from_iterable((idx[e["u"]], idx[e["v"]]) for e in edges),
+        dtype=np.int32,
+        count=2 * m,
+    ).reshape(-1, 2)
+    c = np.fromiter((float(e.get("conductance", 1.0)) for e in edges), dtype=np.float64, count=m)
+    if (c == 1.0).all():
+        # condutâncias unitárias: adjacência simétrica + Laplaciano do csgraph (em C)
+        A = sp.csr_matrix((np.ones(2 * m), (ends.T.ravel(), ends[:, ::-1].T.ravel())), shape=(n, n))
+        L = csgraph.laplacian(A).tocsr()
+    else:
+        # linhas [u, v, u, v] x colunas [u, v, v, u]: diagonal (+c) e fora da diagonal (-c)
+        rows = np.tile(ends.T.ravel(), 2)
+        cols = np.concatenate([ends.T.ravel(), ends[:, ::-1].T.ravel()])
+        vals = np.concatenate([c, c, -c, -c])
+        L = sp.csr_matrix((vals, (rows, cols)), shape=(n, n))
     meta = data.get("graph", {})
     return L, w, meta, nodes
 
-def _projector_mean_zero(weights: np.ndarray) -> sp.csr_matrix:
-    # P = I - 1 w^T, com w normalizado para soma 1
+def _normalized_weights(weights: np.ndarray) -> np.ndarray:
+    # w normalizado para soma 1 (uniforme se a soma não for positiva)
     w = weights.astype(float)
     s = float(w.sum())
     if s <= 0:
         w = np.ones_like(w)
         s = float(w.sum())
-    wn = w / s
-    ones = np.ones((len(wn), 1), dtype=float)
-    P_dense = np.eye(len(wn)) - ones @ wn.reshape(1, -1)
-    return sp.csr_matrix(P_dense)
+    return w / s
 
 def _renormalize(L: sp.csr_matrix, rho: float) -> sp.csr_matrix:
     rho = float(rho) if rho is not None else 1.0
     return (rho * L).tocsr()
 
+# tolerância do eigsh (1e-8 por padrão; pode ser relaxada por ambiente em execuções exploratórias)
+EIGSH_TOL = float(os.environ.get("TESA_EIGSH_TOL", "1e-8"))
+
+def _starting_vector(L: sp.csr_matrix) -> np.ndarray:
+    # v0 determinístico para o ARPACK: vetor de graus centrado (heurística de Fiedler),
+    # ortogonal ao modo nulo. Em grafos regulares ele se anula; usamos então um vetor
+    # pseudoaleatório de semente fixa, também centrado.
+    v0 = np.asarray(L.diagonal(), dtype=np.float64)
+    v0 = v0 - v0.mean()
+    norm = np.linalg.norm(v0)
+    if norm <= 1e-12 * max(1.0, float(np.abs(L.diagonal()).max(initial=0.0))):
+        v0 = np.random.default_rng(0).standard_normal(L.shape[0])
+        v0 -= v0.mean()
+        norm = np.linalg.norm(v0)
+    return v0 / (norm + 1e-30)
+
+# regularização de L + eps I na fatoração usada pelo shift-invert
+SHIFT_INVERT_EPS = 1e-10
+
+def _shift_invert_operator(L: sp.csr_matrix, eps: float = SHIFT_INVERT_EPS) -> spla.LinearOperator:
+    # OPinv b = Q (L + eps I)^{-1} Q b, com Q = I - 1 1^T / n.
+    # Como L 1 = 0 e 1^T L = 0, P^T L P = L para qualquer peso, e o modo nulo 1 é
+    # removido por Q; assim os autovalores retornados pelo eigsh em modo sigma=0 são
+    # lambda + eps para os autovalores positivos de L.
+    n = L.shape[0]
+    lu = spla.splu((L + eps * sp.identity(n, format="csr")).tocsc())
+
+    def matvec(b: np.ndarray) -> np.ndarray:
+        b = np.ravel(b)
+        x = lu.solve(b - b.mean())
+        return x - x.mean()
+
+    return spla.LinearOperator((n, n), matvec=matvec, dtype=float)
+
 def _smallest_positive_eig(L: sp.csr_matrix, weights: np.ndarray, k: int = 3, tol: float = 1e-8, maxiter: int | None = None) -> Dict[str, Any]:
-    # projeta para subespaço de média-zero: L_hat = P^T L P
-    P = _projector_mean_zero(weights)
-    # Evita densificação de P^T L P: usamos operador linear implícito
-    # Definimos A x = P^T L (P x)
+    # projeta para subespaço de média-zero: L_hat = P^T L P, com P = I - 1 w^T
+    # P nunca é materializado: P x = x - (w·x) 1 e P^T z = z - (1·z) w,
+    # de modo que cada matvec custa O(n + nnz) em vetores 1-D.
+    wn = _normalized_weights(weights)
     n = L.shape[0]
 
     def matvec(x: np.ndarray) -> np.ndarray:
-        x = x.reshape(-1, 1)
-        y = P @ x
+        x = np.ravel(x)
+        y = x - wn @ x
         z = L @ y
-        r = P.T @ z
-        return r.ravel()
+        return z - z.sum() * wn
 
     A = spla.LinearOperator((n, n), matvec=matvec, dtype=float)
 
     # Tentamos obter os k menores autovalores em módulo > 0 com eigsh
     k_eff = min(max(1, k), max(1, n - 1))
+    v0 = _starting_vector(L)
     try:
-        vals, vecs = spla.eigsh(A, k=k_eff, which="SM", tol=tol, maxiter=maxiter)
+        try:
+            # shift-invert em sigma=0: converge em poucas iterações para o extremo inferior
+            OPinv = _shift_invert_operator(L)
+            vals, vecs = spla.eigsh(A, k=k_eff, sigma=0.0, which="LM", OPinv=OPinv, tol=tol, maxiter=maxiter, v0=v0)
+            vals = vals - SHIFT_INVERT_EPS
+        except Exception:
+            # fatoração ou ARPACK em modo 3 falhou: iteração sem shift
+            vals, vecs = spla.eigsh(A, k=k_eff, which="SM", tol=tol, maxiter=maxiter, v0=v0)
         # Filtra quase-zero numérico
         vals_sorted = np.sort(np.real(vals))
         pos = [v for v in vals_sorted if v > 1e-12]
@@ -116,41 +163,48 @@ def _process_one(graph_path: Path) -> Dict[str, Any]:
     # Metadados
     op_meta = {
         "graph_id": gid,
+        "source": graph_path.name,
         "n": int(L.shape[0]),
         "rho": rho,
         "nodes": nodes,
+        "metadata": meta.get("metadata", {}),
     }
     write_json(OPERATORS_DIR / f"{gid}_meta.json", op_meta, indent=2)
 
     # Espectro
-    spec = _smallest_positive_eig(Lhat, w, k=3, tol=1e-8, maxiter=None)
+    spec = _smallest_positive_eig(Lhat, w, k=3, tol=EIGSH_TOL, maxiter=None)
     spec["graph_id"] = gid
     spec["n"] = int(L.shape[0])
     spec["rho"] = rho
 
     return spec
 
-def compute_all() -> List[Dict[str, Any]]:
+def _process_one_safe(graph_path: Path) -> Dict[str, Any]:
+    # Função de topo (serializável) para o ProcessPoolExecutor: erros viram registros.
+    try:
+        return _process_one(graph_path)
+    except Exception as e:
+        return {
+            "graph_id": graph_path.stem,
+            "error": str(e),
+        }
+
+def compute_all(save_formats: Tuple[str, ...] = ("json",), max_workers: Optional[int] = 1) -> List[Dict[str, Any]]:
+    # max_workers: nº de processos (um grafo por tarefa); 1 (padrão) executa em série,
+    # None usa os.cpu_count(). A ordem dos resultados segue a lista de arquivos.
     ensure_dir(RESULTS_DIR)
-    # lista de grafos
-    files: List[Path] = []
-    for ext in ("*.json", "*.yaml", "*.yml"):
-        files.extend(sorted((GRAPHS_DIR).glob(ext)))
-    files = [p for p in files if p.stem not in ("index",)]
+    # lista de grafos: um arquivo por grafo; o JSON tem precedência sobre a cópia YAML
+    files: List[Path] = list_structured_files(GRAPHS_DIR)
 
     if not files:
         raise FileNotFoundError(f"Nenhum grafo serializado encontrado em {GRAPHS_DIR}. Execute scripts/prep/build_graphs.py.")
 
-    results: List[Dict[str, Any]] = []
-    for p in files:
-        try:
-            res = _process_one(p)
-            results.append(res)
-        except Exception as e:
-            results.append({
-                "graph_id": p.stem,
-                "error": str(e),
-            })
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results: List[Dict[str, Any]] = list(ex.map(_process_one_safe, files))
+    else:
+        results = [_process_one_safe(p) for p in files]
 
     # salvar CSV simples e JSON agregado
     # CSV mínimo: graph_id, n, rho, lambda1, k_used, notes
@@ -159,8 +213,9 @@ def compute_all() -> List[Dict[str, Any]]:
     with open(csv_path, "w", newline="", encoding="utf-8") as f:
         wcsv = csv.writer(f)
         wcsv.writerow(["graph_id", "n", "rho", "lambda1", "k_used", "tol", "notes"])
-        for r in results:
-            wcsv.writerow([
+        # todas as linhas numa única chamada (writerows itera em C)
+        wcsv.writerows(
+            (
                 r.get("graph_id"),
                 r.get("n"),
                 r.get("rho"),
@@ -168,10 +223,13 @@ def compute_all() -> List[Dict[str, Any]]:
                 r.get("k_used"),
                 r.get("tol"),
                 r.get("notes", ""),
-            ])
+            )
+            for r in results
+        )
 
     write_json(RESULTS_DIR / "summary_spectrum.json", {"results": results}, indent=2)
-    write_yaml(RESULTS_DIR / "summary_spectrum.yaml", {"results": results})
+    if "yaml" in save_formats:
+        write_yaml_index(RESULTS_DIR / "summary_spectrum.yaml", {"results": results})
     return results
 
 if __name__ == "__main__":
@@ -1,11 +1,15 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+import os
 import numpy as np
 import scipy.sparse as sp
+import scipy.sparse.csgraph as csgraph
 import scipy.sparse.linalg as spla
 
-from scripts.common.io_utils import read_json, read_yaml, ensure_dir, write_json, write_yaml
+from scripts.common.io_utils import read_json, read_structured, ensure_dir, list_structured_files, write_json, write_yaml_index
 
 BUILD_DIR = Path("tesa-machine/build")
 GRAPHS_DIR = BUILD_DIR / "graphs"
@@ -13,148 +17,186 @@ OPERATORS_DIR = BUILD_DIR / "operators"
 RESULTS_DIR = Path("tesa-machine/results") / "physics"
 
 def _load_graph_serial(path: Path) -> Dict[str, Any]:
-    if path.suffix.lower() == ".json":
-        return read_json(path)
-    elif path.suffix.lower() in (".yml", ".yaml"):
-        return read_yaml(path)
-    else:
-        raise ValueError(f"Formato não suportado: {path}")
+    # JSON via orjson; YAML pequeno via espelho JSON em cache (ValueError para outros formatos)
+    return read_structured(path)
 
 def _serial_to_laplacian_and_index(data: Dict[str, Any]) -> Tuple[sp.csr_matrix, Dict[str, int], Dict[str, Any]]:
     nodes = [nrec["id"] for nrec in data.get("nodes", [])]
     idx = {v: i for i, v in enumerate(nodes)}
     n = len(nodes)
 
-    L = sp.lil_matrix((n, n), dtype=float)
-    for erec in data.get("edges", []):
-        u, v = erec["u"], erec["v"]
-        c = float(erec.get("conductance", 1.0))
-        i, j = idx[u], idx[v]
-        L[i, i] += c
-        L[j, j] += c
-        L[i, j] -= c
-        L[j, i] -= c
-    L = L.tocsr()
+    # triplets COO; duplicatas são somadas na conversão para CSR
+    edges = data.get("edges", [])
+    m = len(edges)
+    # extremos numa única passada (pares u, v intercalados); índices int32 como no CSR
+    ends = np.fromiter(
+        chain.from_iterable((idx[e["u"]], idx[e["v"]]) for e in edges),
+        dtype=np.int32,
+        count=2 * m,
+    ).reshape(-1, 2)
+    c = np.fromiter((float(e.get("conductance", 1.0)) for e in edges), dtype=np.float64, count=m)
+    # linhas [u, v, u, v] x colunas [u, v, v, u]: diagonal (+c) e fora da diagonal (-c)
+    rows = np.tile(ends.T.ravel(), 2)
+    cols = np.concatenate([ends.T.ravel(), ends[:, ::-1].T.ravel()])
+    vals = np.concatenate([c, c, -c, -c])
+    L = sp.csr_matrix((vals, (rows, cols)), shape=(n, n))
     meta = data.get("graph", {})
     return L, idx, meta
 
-def _pseudoinverse_laplacian(L: sp.csr_matrix, tol: float = 1e-10) -> sp.csr_matrix:
-    # Computes Moore-Penrose pseudoinverse of Laplacian via eigendecomposition on dense small matrices
+def _load_cached_laplacian(gid: str, graph_path: Path) -> Optional[Tuple[sp.csr_matrix, Dict[str, int]]]:
+    # Reaproveita o operador L salvo por compute_spectrum (<gid>_Lz.npz + <gid>_meta.json),
+    # desde que não seja mais antigo que o grafo serializado. Retorna None caso contrário.
+    npz_path = OPERATORS_DIR / f"{gid}_Lz.npz"
+    meta_path = OPERATORS_DIR / f"{gid}_meta.json"
+    if not (npz_path.exists() and meta_path.exists()):
+        return None
+    src_mtime = graph_path.stat().st_mtime_ns
+    if npz_path.stat().st_mtime_ns < src_mtime or meta_path.stat().st_mtime_ns < src_mtime:
+        return None
+    nodes = read_json(meta_path).get("nodes", [])
+    L = sp.load_npz(npz_path).tocsr()
+    if L.shape != (len(nodes), len(nodes)):
+        return None
+    return L, {v: i for i, v in enumerate(nodes)}
+
+try:
+    from sksparse.cholmod import cholesky as _cholmod_cholesky  # opcional
+except ImportError:
+    _cholmod_cholesky = None
+
+# número de arestas resolvidas por bloco de lados direitos (limita a memória a n x RHS_BLOCK)
+RHS_BLOCK = 256
+
+def _grounded_solver(L: sp.csr_matrix) -> Tuple[Any, np.ndarray]:
+    # Aterra um nó por componente conexa (potencial 0) e fatora o Laplaciano reduzido,
+    # que é simétrico definido positivo. Retorna (solve, pos), onde pos[i] é o índice
+    # de i no sistema reduzido ou -1 se i foi aterrado.
     n = L.shape[0]
-    if n <= 200:
-        # Dense path for small graphs
-        Ld = L.toarray()
-        vals, vecs = np.linalg.eigh(Ld)
-        inv_vals = np.zeros_like(vals)
-        for i, lam in enumerate(vals):
-            if lam > tol:
-                inv_vals[i] = 1.0 / lam
-            else:
-                inv_vals[i] = 0.0
-        Lpinv = (vecs @ np.diag(inv_vals) @ vecs.T)
-        return sp.csr_matrix(Lpinv)
-    else:
-        # Iterative approximation: use shift to handle nullspace
-        # Compute k smallest positive eigenpairs
-        try:
-            k = min(50, max(1, n - 1))
-            vals, vecs = spla.eigsh(L, k=k, which="SM", tol=1e-8)
-            # filter non-positive
-            mask = vals > tol
-            vals = vals[mask]
-            vecs = vecs[:, mask]
-            Lpinv = (vecs @ np.diag(1.0 / vals) @ vecs.T)
-            return sp.csr_matrix(Lpinv)
-        except Exception:
-            # Fallback to dense if iterative fails (may be heavy)
-            Ld = L.toarray()
-            vals, vecs = np.linalg.eigh(Ld)
-            inv_vals = np.zeros_like(vals)
-            for i, lam in enumerate(vals):
-                if lam > tol:
-                    inv_vals[i] = 1.0 / lam
-                else:
-                    inv_vals[i] = 0.0
-            Lpinv = (vecs @ np.diag(inv_vals) @ vecs.T)
-            return sp.csr_matrix(Lpinv)
-
-def _effective_resistance(Lpinv: np.ndarray | sp.spmatrix, i: int, j: int) -> float:
-    # R_ij = L^+_ii + L^+_jj - 2 L^+_ij
-    if sp.issparse(Lpinv):
-        Lp = Lpinv.toarray()
-    else:
-        Lp = np.asarray(Lpinv)
-    return float(Lp[i, i] + Lp[j, j] - 2.0 * Lp[i, j])
-
-def compute_effective_resistances() -> Dict[str, Any]:
+    A = L.copy()
+    A.eliminate_zeros()
+    _, labels = csgraph.connected_components(A, directed=False)
+    grounded = np.zeros(n, dtype=bool)
+    _, first = np.unique(labels, return_index=True)
+    grounded[first] = True
+    keep = np.flatnonzero(~grounded)
+    pos = np.full(n, -1, dtype=np.intp)
+    pos[keep] = np.arange(keep.size)
+    L0 = L[keep][:, keep].tocsc()
+    if keep.size == 0:
+        return (lambda B: B), pos
+    if _cholmod_cholesky is not None:
+        return _cholmod_cholesky(L0), pos
+    return spla.splu(L0).solve, pos
+
+def _effective_resistances(L: sp.csr_matrix, u_idx: np.ndarray, v_idx: np.ndarray) -> np.ndarray:
+    # R_uv = (e_u - e_v)^T x, com L0 x = (e_u - e_v) restrito aos nós não aterrados.
+    # Uma única fatoração; lados direitos resolvidos em blocos de RHS_BLOCK arestas.
+    solve, pos = _grounded_solver(L)
+    n_r = int((pos >= 0).sum())
+    m = len(u_idx)
+    R = np.zeros(m, dtype=np.float64)
+    pu, pv = pos[u_idx], pos[v_idx]
+    for start in range(0, m, RHS_BLOCK):
+        stop = min(start + RHS_BLOCK, m)
+        bu, bv = pu[start:stop], pv[start:stop]
+        cols = np.arange(stop - start)
+        B = np.zeros((n_r, stop - start), dtype=np.float64)
+        np.add.at(B, (bu[bu >= 0], cols[bu >= 0]), 1.0)
+        np.add.at(B, (bv[bv >= 0], cols[bv >= 0]), -1.0)
+        X = np.asarray(solve(B)).reshape(n_r, stop - start)
+        xu = np.where(bu >= 0, X[np.maximum(bu, 0), cols], 0.0)
+        xv = np.where(bv >= 0, X[np.maximum(bv, 0), cols], 0.0)
+        R[start:stop] = xu - xv
+    return R
+
+def _process_graph(p: Path) -> Optional[Dict[str, Any]]:
+    # Função de topo (serializável) para o ProcessPoolExecutor: calcula e grava as
+    # resistências de um grafo; em caso de erro grava <stem>.error.json e retorna None.
+    try:
+        data = _load_graph_serial(p)
+        meta = data.get("graph", {})
+        gid = meta.get("id") or p.stem
+        # operador já montado por compute_spectrum, se atualizado; senão monta a partir do grafo
+        cached = _load_cached_laplacian(gid, p)
+        if cached is not None:
+            L, idx = cached
+        else:
+            L, idx, meta = _serial_to_laplacian_and_index(data)
+        n = L.shape[0]
+
+        # Resistências efetivas para todas as arestas do grafo (pares com condutância > 0)
+        edges = data.get("edges", [])
+        u_idx = np.fromiter((idx[e["u"]] for e in edges), dtype=np.intp, count=len(edges))
+        v_idx = np.fromiter((idx[e["v"]] for e in edges), dtype=np.intp, count=len(edges))
+        R = _effective_resistances(L, u_idx, v_idx)
+        resistances: List[Dict[str, Any]] = [
+            {
+                "u": e["u"],
+                "v": e["v"],
+                "effective_resistance": Rij,
+                "conductance": float(e.get("conductance", 1.0)),
+            }
+            # tolist(): conversão para float nativo numa única chamada em C,
+            # pronta para o caminho orjson de write_json
+            for e, Rij in zip(edges, R.tolist())
+        ]
+
+        # Estatísticas simples, direto sobre o array R (sem lista intermediária)
+        has_values = R.size > 0
+        stats = {
+            "min": float(R.min()) if has_values else None,
+            "max": float(R.max()) if has_values else None,
+            "mean": float(R.mean()) if has_values else None,
+            "median": float(np.median(R)) if has_values else None,
+        }
+
+        payload = {
+            "graph_id": gid,
+            "n": int(n),
+            "rho": float(meta.get("rho", 1.0)),
+            "resistances_on_edges": resistances,
+            "stats": stats,
+        }
+
+        out_dir = ensure_dir(RESULTS_DIR / "effective_resistance")
+        # por grafo apenas JSON (é o que os relatórios releem via path_json)
+        write_json(out_dir / f"{gid}.json", payload, indent=2)
+
+        # o índice carrega n, rho e stats para que os relatórios não releiam o JSON por grafo
+        return {
+            "graph_id": gid,
+            "n": payload["n"],
+            "rho": payload["rho"],
+            "stats": stats,
+            "path_json": str(out_dir / f"{gid}.json"),
+        }
+    except Exception as e:
+        err_dir = ensure_dir(RESULTS_DIR / "effective_resistance")
+        write_json(err_dir / f"{p.stem}.error.json", {"graph_id": p.stem, "error": str(e)}, indent=2)
+        return None
+
+def compute_effective_resistances(save_formats: Tuple[str, ...] = ("json",), max_workers: Optional[int] = 1) -> Dict[str, Any]:
+    # max_workers: nº de processos (um grafo por tarefa); 1 (padrão) executa em série,
+    # None usa os.cpu_count(). A ordem do índice segue a lista de arquivos.
     ensure_dir(RESULTS_DIR)
-    files: List[Path] = []
-    for ext in ("*.json", "*.yaml", "*.yml"):
-        files.extend(sorted((GRAPHS_DIR).glob(ext)))
-    files = [p for p in files if p.stem not in ("index",)]
+    # um arquivo por grafo; o JSON tem precedência sobre a cópia YAML
+    files: List[Path] = list_structured_files(GRAPHS_DIR)
 
     if not files:
         raise FileNotFoundError(f"Nenhum grafo encontrado em {GRAPHS_DIR}. Execute scripts/prep/build_graphs.py.")
 
-    results_index: List[Dict[str, Any]] = []
-
-    for p in files:
-        try:
-            data = _load_graph_serial(p)
-            L, idx, meta = _serial_to_laplacian_and_index(data)
-            gid = meta.get("id") or p.stem
-            n = L.shape[0]
-
-            # Pseudoinversa
-            Lpinv = _pseudoinverse_laplacian(L)
-
-            # Resistências efetivas para todas as arestas do grafo (pares com condutância > 0)
-            resistances: List[Dict[str, Any]] = []
-            for e in data.get("edges", []):
-                u, v = e["u"], e["v"]
-                i, j = idx[u], idx[v]
-                Rij = _effective_resistance(Lpinv, i, j)
-                resistances.append({
-                    "u": u,
-                    "v": v,
-                    "effective_resistance": Rij,
-                    "conductance": float(e.get("conductance", 1.0)),
-                })
-
-            # Estatísticas simples
-            values = [r["effective_resistance"] for r in resistances]
-            stats = {
-                "min": float(np.min(values)) if values else None,
-                "max": float(np.max(values)) if values else None,
-                "mean": float(np.mean(values)) if values else None,
-                "median": float(np.median(values)) if values else None,
-            }
-
-            payload = {
-                "graph_id": gid,
-                "n": int(n),
-                "rho": float(meta.get("rho", 1.0)),
-                "resistances_on_edges": resistances,
-                "stats": stats,
-            }
-
-            out_dir = ensure_dir(RESULTS_DIR / "effective_resistance")
-            write_json(out_dir / f"{gid}.json", payload, indent=2)
-            write_yaml(out_dir / f"{gid}.yaml", payload)
-
-            results_index.append({
-                "graph_id": gid,
-                "path_json": str(out_dir / f"{gid}.json"),
-                "path_yaml": str(out_dir / f"{gid}.yaml"),
-            })
-
-        except Exception as e:
-            err_dir = ensure_dir(RESULTS_DIR / "effective_resistance")
-            write_json(err_dir / f"{p.stem}.error.json", {"graph_id": p.stem, "error": str(e)}, indent=2)
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            entries = list(ex.map(_process_graph, files))
+    else:
+        entries = [_process_graph(p) for p in files]
+    results_index: List[Dict[str, Any]] = [e for e in entries if e is not None]
 
     # índice geral
     write_json(RESULTS_DIR / "effective_resistance_index.json", {"results": results_index}, indent=2)
-    write_yaml(RESULTS_DIR / "effective_resistance_index.yaml", {"results": results_index})
+    if "yaml" in save_formats:
+        write_yaml_index(RESULTS_DIR / "effective_resistance_index.yaml", {"results": results_index})
     return {"results": results_index}
 
 if __name__ == "__main__":
@@ -1,11 +1,15 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Callable
+from typing import Any, Dict, List, Optional, Tuple, Callable
 
+import os
 import numpy as np
 import scipy.sparse as sp
 import scipy.sparse.linalg as spla
+from scipy.fft import dctn, idctn
 
-from scripts.common.io_utils import read_json, read_yaml, ensure_dir, write_json, write_yaml
+from scripts.common.io_utils import read_json, read_yaml, read_structured, ensure_dir, list_structured_files, write_json, write_payload, write_yaml_index
 
 BUILD_DIR = Path("tesa-machine/build")
 GRAPHS_DIR = BUILD_DIR / "graphs"
@@ -13,66 +17,201 @@ OPERATORS_DIR = BUILD_DIR / "operators"
 RESULTS_DIR = Path("tesa-machine/results") / "physics"
 
 def _load_graph_serial(path: Path) -> Dict[str, Any]:
-    if path.suffix.lower() == ".json":
-        return read_json(path)
-    elif path.suffix.lower() in (".yml", ".yaml"):
-        return read_yaml(path)
-    else:
-        raise ValueError(f"Formato não suportado: {path}")
+    # JSON via orjson; YAML pequeno via espelho JSON em cache (ValueError para outros formatos)
+    return read_structured(path)
 
-def _serial_to_laplacian_incidence(data: Dict[str, Any]) -> Tuple[sp.csr_matrix, sp.csr_matrix, Dict[str, int], Dict[str, Any]]:
-    # Retorna Laplaciano L = B^T C B, incidência B, índice de nós e metadados
+def _edge_arrays(data: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, Dict[str, int], int]:
+    # Extremos (m x 2, int32) e condutâncias das arestas, índice de nós e n
     nodes = [nrec["id"] for nrec in data.get("nodes", [])]
     idx = {v: i for i, v in enumerate(nodes)}
     n = len(nodes)
-    edges = [(e["u"], e["v"], float(e.get("conductance", 1.0))) for e in data.get("edges", [])]
+    edges = data.get("edges", [])
     m = len(edges)
     if m == 0 or n == 0:
         raise ValueError("Grafo vazio.")
 
-    # Incidência orientada arbitrariamente
-    row = []
-    col = []
-    val = []
-    for eid, (u, v, c) in enumerate(edges):
-        i = idx[u]
-        j = idx[v]
-        # linha eid
-        row += [eid, eid]
-        col += [i, j]
-        val += [1.0, -1.0]
-    B = sp.coo_matrix((val, (row, col)), shape=(m, n)).tocsr()
-
-    # Matriz de condutâncias por aresta (diagonal)
-    C = sp.diags([c for (_, _, c) in edges], offsets=0, shape=(m, m), format="csr")
-
-    # Laplaciano L = B^T C B
-    L = (B.T @ C @ B).tocsr()
+    # extremos numa única passada (pares u, v intercalados) e condutâncias
+    ends = np.fromiter(
+        chain.from_iterable((idx[e["u"]], idx[e["v"]]) for e in edges),
+        dtype=np.int32,
+        count=2 * m,
+    ).reshape(-1, 2)
+    c = np.fromiter((float(e.get("conductance", 1.0)) for e in edges), dtype=np.float64, count=m)
+    return ends, c, idx, n
+
+def _laplacian_from_edges(ends: np.ndarray, c: np.ndarray, n: int) -> sp.csr_matrix:
+    # L = B^T C B montado diretamente em COO (sem B, C nem produtos esparsos):
+    # linhas [u, v, u, v] x colunas [u, v, v, u]; duplicatas somadas na conversão para CSR
+    rows = np.tile(ends.T.ravel(), 2)
+    cols = np.concatenate([ends.T.ravel(), ends[:, ::-1].T.ravel()])
+    vals = np.concatenate([c, c, -c, -c])
+    return sp.csr_matrix((vals, (rows, cols)), shape=(n, n))
 
+def _serial_to_laplacian(data: Dict[str, Any]) -> Tuple[sp.csr_matrix, Dict[str, int], Dict[str, Any]]:
+    # Retorna apenas Laplaciano L, índice de nós e metadados (caminho usado pelas energias)
+    ends, c, idx, n = _edge_arrays(data)
+    L = _laplacian_from_edges(ends, c, n)
+    meta = data.get("graph", {})
+    return L, idx, meta
+
+def _serial_to_laplacian_incidence(data: Dict[str, Any]) -> Tuple[sp.csr_matrix, sp.csr_matrix, Dict[str, int], Dict[str, Any]]:
+    # Retorna Laplaciano L = B^T C B, incidência B, índice de nós e metadados
+    ends, c, idx, n = _edge_arrays(data)
+    m = ends.shape[0]
+
+    # Incidência orientada arbitrariamente: linha eid = e_u - e_v.
+    # Exatamente 2 entradas por linha: CSR montado direto (indptr = 0, 2, 4, ...),
+    # sem passar por COO; sum_duplicates só atua em laços (u == v), que se anulam.
+    indptr = np.arange(0, 2 * m + 1, 2, dtype=np.int32)
+    vals_B = np.tile(np.array([1.0, -1.0]), m)
+    B = sp.csr_matrix((vals_B, ends.ravel(), indptr), shape=(m, n))
+    B.sum_duplicates()
+
+    L = _laplacian_from_edges(ends, c, n)
     meta = data.get("graph", {})
     return L, B, idx, meta
 
-def _fenchel_energy_quadratic(L: sp.csr_matrix, b: np.ndarray) -> float:
+def _load_cached_operator(
+    gid: str, graph_path: Path, require_source: bool = False
+) -> Optional[Tuple[sp.csr_matrix, Dict[str, int], Dict[str, Any]]]:
+    # Reaproveita <gid>_Lz.npz + <gid>_meta.json (formato de compute_spectrum) se não forem
+    # mais antigos que o grafo serializado; None se ausentes, desatualizados, vazios ou
+    # sem "metadata" (gravados antes da dica de grade; regravados na montagem).
+    # "source" (nome do arquivo do grafo) precisa coincidir com graph_path quando gravado;
+    # require_source=True também rejeita metas sem "source" (busca pelo stem, sem o id real).
+    npz_path = OPERATORS_DIR / f"{gid}_Lz.npz"
+    meta_path = OPERATORS_DIR / f"{gid}_meta.json"
+    if not (npz_path.exists() and meta_path.exists()):
+        return None
+    src_mtime = graph_path.stat().st_mtime_ns
+    if npz_path.stat().st_mtime_ns < src_mtime or meta_path.stat().st_mtime_ns < src_mtime:
+        return None
+    op_meta = read_json(meta_path)
+    if "metadata" not in op_meta:
+        return None
+    source = op_meta.get("source")
+    if (source is None and require_source) or (source is not None and source != graph_path.name):
+        return None
+    nodes = op_meta.get("nodes", [])
+    L = sp.load_npz(npz_path).tocsr()
+    if L.shape != (len(nodes), len(nodes)) or L.nnz == 0:
+        return None
+    meta = {"id": gid, "rho": op_meta.get("rho", 1.0), "metadata": op_meta["metadata"]}
+    return L, {v: i for i, v in enumerate(nodes)}, meta
+
+def _save_operator(gid: str, L: sp.csr_matrix, idx: Dict[str, int], meta: Dict[str, Any], source: str) -> None:
+    # Persiste L no mesmo formato de compute_spectrum, para reuso entre execuções/etapas
+    ensure_dir(OPERATORS_DIR)
+    sp.save_npz(OPERATORS_DIR / f"{gid}_Lz.npz", L)
+    write_json(OPERATORS_DIR / f"{gid}_meta.json", {
+        "graph_id": gid,
+        "source": source,
+        "n": int(L.shape[0]),
+        "rho": float(meta.get("rho", 1.0)),
+        "nodes": list(idx),
+        "metadata": meta.get("metadata", {}),
+    }, indent=2)
+
+try:
+    from sksparse.cholmod import cholesky as _cholmod_cholesky  # opcional
+except ImportError:
+    _cholmod_cholesky = None
+
+# regularização de L + eps I na fatoração (L é singular: kernel = constantes)
+FACTOR_EPS = 1e-10
+
+def _factorize_laplacian(L: sp.csr_matrix, eps: float = FACTOR_EPS) -> Callable[[np.ndarray], np.ndarray]:
+    # Fatoração esparsa única de L + eps I (CHOLMOD se disponível, senão SuperLU);
+    # retorna solve(b), reutilizável por todos os cenários do mesmo grafo.
+    n = L.shape[0]
+    A = (L + eps * sp.identity(n, format="csr")).tocsc()
+    if _cholmod_cholesky is not None:
+        return _cholmod_cholesky(A)
+    return spla.splu(A).solve
+
+def _grid_shape(meta: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    # Dica de grade {"kind": "grid", "shape": [H, W]} nos metadados do grafo (ou no topo)
+    for hint in (meta.get("metadata") or {}, meta):
+        if isinstance(hint, dict) and hint.get("kind") == "grid" and len(hint.get("shape") or ()) == 2:
+            H, W = (int(s) for s in hint["shape"])
+            return H, W
+    return None
+
+def _grid_solver(L: sp.csr_matrix, meta: Dict[str, Any]) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+    # Grade H x W (nós em ordem linha-maior, condutância uniforme c): L = c (L_H ⊗ I + I ⊗ L_W),
+    # diagonalizado pela DCT-II (contorno de Neumann), autovalores c (2 - 2cos(πi/H) + 2 - 2cos(πj/W)).
+    # solve(b) = L^+ b em O(n log n), com o modo constante zerado. None se a dica não conferir com L.
+    shape = _grid_shape(meta)
+    if shape is None:
+        return None
+    H, W = shape
+    if H * W != L.shape[0] or H * W < 2:
+        return None
+
+    def path_laplacian(k: int) -> sp.csr_matrix:
+        main = np.full(k, 2.0)
+        main[[0, -1]] = 1.0
+        return sp.diags([main, -np.ones(k - 1), -np.ones(k - 1)], [0, -1, 1], format="csr") if k > 1 else sp.csr_matrix((1, 1))
+
+    L_grid = sp.kron(path_laplacian(H), sp.identity(W), format="csr") + sp.kron(sp.identity(H), path_laplacian(W), format="csr")
+    c = float(L.diagonal()[0]) / float(L_grid.diagonal()[0])
+    if not c > 0 or abs(L - c * L_grid).max() > 1e-12 * c:
+        return None
+
+    lam = c * (
+        (2.0 - 2.0 * np.cos(np.pi * np.arange(H) / H))[:, None]
+        + (2.0 - 2.0 * np.cos(np.pi * np.arange(W) / W))[None, :]
+    )
+    lam[0, 0] = np.inf  # pseudo-inversa: modo constante (kernel) anulado
+
+    def solve(b: np.ndarray) -> np.ndarray:
+        coef = dctn(np.reshape(b, (H, W)), type=2, norm="ortho") / lam
+        return idctn(coef, type=2, norm="ortho").ravel()
+
+    return solve
+
+def _fenchel_energy_quadratic(L: sp.csr_matrix, b: np.ndarray, solve: Callable[[np.ndarray], np.ndarray] | None = None) -> float:
     # Energia de Fenchel para f(x)=1/2 x^T L x com restrição L x = b é:
     # f*(y) = 1/2 b^T L^+ b, onde y = L x e x = L^+ b (no subespaço ortogonal ao kernel)
     # Portanto energia = 1/2 b^T L^+ b
     n = L.shape[0]
     # Resolver L x = b no subespaço de média-zero via CG com condicionamento leve
     # Usamos solver em subespaço ortogonal ao kernel: projetamos b para soma zero
-    ones = np.ones(n)
-    b_proj = b - ones * (np.dot(ones, b) / np.dot(ones, ones))
+    b_proj = b - b.mean()
 
-    # Definir operador linear simétrico positivo no subespaço
-    def matvec(x):
-        return (L @ x)
+    # Caminho principal: solução direta com a fatoração esparsa de L + eps I
+    # (b_proj é ortogonal ao kernel, então x aproxima L^+ b_proj com erro O(eps)).
+    try:
+        if solve is None:
+            solve = _factorize_laplacian(L)
+        x = np.asarray(solve(b_proj), dtype=float).ravel()
+        # um passo de refinamento iterativo remove o viés O(eps) da regularização
+        x = x + np.asarray(solve(b_proj - L @ x), dtype=float).ravel()
+        info = 0 if np.all(np.isfinite(x)) else 1
+    except Exception:
+        info = 1
 
-    A = spla.LinearOperator(L.shape, matvec=matvec, dtype=float)
+    if info != 0:
+        # fatoração indisponível/falhou: CG no operador L com precondicionador de Jacobi
+        def matvec(x):
+            return (L @ x)
 
-    x, info = spla.cg(A, b_proj, tol=1e-8, maxiter=5_000)
+        A = spla.LinearOperator(L.shape, matvec=matvec, dtype=float)
+        d = L.diagonal().astype(float)
+        d[d == 0] = 1.0
+        d_inv = 1.0 / d
+        M = spla.LinearOperator(L.shape, matvec=lambda r: d_inv * np.ravel(r), dtype=float)
+        x, info = spla.cg(A, b_proj, M=M, rtol=1e-7, maxiter=2_000)
     if info != 0:
-        # fallback: regularização leve
+        # fallback: regularização leve, precondicionada por ILU incompleta
         eps = 1e-8
-        x, info2 = spla.cg(L + eps * sp.eye(n, format="csr"), b_proj, tol=1e-8, maxiter=10_000)
+        L_reg = L + eps * sp.eye(n, format="csr")
+        try:
+            ilu = spla.spilu(L_reg.tocsc())
+            M_ilu = spla.LinearOperator(L.shape, matvec=ilu.solve, dtype=float)
+        except Exception:
+            M_ilu = None
+        x, info2 = spla.cg(L_reg, b_proj, M=M_ilu, rtol=1e-8, maxiter=10_000)
         if info2 != 0:
             # última tentativa: denso (pequenos)
             try:
@@ -86,19 +225,85 @@ def _fenchel_energy_quadratic(L: sp.csr_matrix, b: np.ndarray) -> float:
     energy = 0.5 * float(b_proj @ x)
     return energy
 
-def _build_rhs_from_sources(idx: Dict[str, int], sources: List[Dict[str, Any]]) -> np.ndarray:
+def _resolve_source_nodes(idx: Dict[str, int], nodes: Tuple[str, ...]) -> np.ndarray:
+    # resolve nomes -> índices numa passada (KeyError aqui)
+    try:
+        return np.fromiter((idx[v] for v in nodes), dtype=np.int64, count=len(nodes))
+    except KeyError as e:
+        raise KeyError(f"Nó desconhecido em sources: {e.args[0]}")
+
+def _build_rhs_from_sources(
+    idx: Dict[str, int],
+    sources: List[Dict[str, Any]],
+    out: Optional[np.ndarray] = None,
+    resolved: Optional[Dict[Tuple[str, ...], np.ndarray]] = None,
+) -> np.ndarray:
     # sources: lista de {node: str, injection: float}
-    n = len(idx)
-    b = np.zeros(n, dtype=float)
-    for s in sources:
-        node = s["node"]
-        inj = float(s.get("injection", 0.0))
-        if node not in idx:
-            raise KeyError(f"Nó desconhecido em sources: {node}")
-        b[idx[node]] += inj
+    # out: buffer reaproveitado entre cenários (zerado aqui); resolved: memo
+    # {tupla de nós: índices}, compartilhado pelos cenários de um mesmo grafo.
+    # np.add.at acumula entradas repetidas do mesmo nó.
+    nodes = tuple(s["node"] for s in sources)
+    if resolved is None:
+        pos = _resolve_source_nodes(idx, nodes)
+    else:
+        pos = resolved.get(nodes)
+        if pos is None:
+            pos = resolved[nodes] = _resolve_source_nodes(idx, nodes)
+    inj = np.fromiter((float(s.get("injection", 0.0)) for s in sources), dtype=np.float64, count=len(sources))
+    b = np.empty(len(idx)) if out is None else out
+    b.fill(0.0)
+    np.add.at(b, pos, inj)
     return b
 
-def compute_fenchel_energies(config_path: str | Path | None = None) -> Dict[str, Any]:
+def _solve_group(
+    gid: str,
+    L: sp.csr_matrix,
+    idx: Dict[str, int],
+    meta: Dict[str, Any],
+    group: List[Tuple[int, Dict[str, Any]]],
+) -> List[Tuple[int, Dict[str, Any]]]:
+    # Função de topo (serializável) para o ProcessPoolExecutor: resolve todos os cenários
+    # de um mesmo grafo com uma única fatoração de L. Retorna [(posição, payload)].
+    # grades regulares: solver espectral exato via DCT, sem fatoração
+    solve = _grid_solver(L, meta)
+    if solve is None:
+        try:
+            solve = _factorize_laplacian(L)
+        except Exception:
+            solve = None
+    out: List[Tuple[int, Dict[str, Any]]] = []
+    # Varreduras de parâmetros repetem os mesmos nós: índices resolvidos uma vez por grafo
+    # e um único buffer de b (_fenchel_energy_quadratic não o retém).
+    resolved: Dict[Tuple[str, ...], np.ndarray] = {}
+    b_buf = np.empty(len(idx))
+    for pos, sc in group:
+        sources = sc.get("sources", [])
+        b = _build_rhs_from_sources(idx, sources, out=b_buf, resolved=resolved)
+        # checagem de balanceamento: soma deve ser zero
+        total = float(np.sum(b))
+        if abs(total) > 1e-10:
+            # Corrigir removendo média (tornar soma zero)
+            n = len(b)
+            b = b - total / n
+
+        energy = _fenchel_energy_quadratic(L, b, solve=solve)
+        out.append((pos, {
+            "graph_id": gid,
+            "rho": float(meta.get("rho", 1.0)),
+            "n": int(L.shape[0]),
+            "sources": sources,
+            "energy": float(energy),
+        }))
+    return out
+
+def compute_fenchel_energies(
+    config_path: str | Path | None = None,
+    max_workers: Optional[int] = 1,
+    save_formats: Tuple[str, ...] = ("json",),
+) -> Dict[str, Any]:
+    # max_workers: nº de processos (um grafo por tarefa, com seus cenários); 1 (padrão)
+    # executa em série, None usa os.cpu_count(). Arquivos são gravados no processo principal.
+    # save_formats: YAML (por cenário e índice) só é gravado se "yaml" estiver presente.
     # Configuração opcional:
     # {
     #   "scenarios": [
@@ -107,27 +312,44 @@ def compute_fenchel_energies(config_path: str | Path | None = None) -> Dict[str,
     #   ]
     # }
     ensure_dir(RESULTS_DIR)
-    files: List[Path] = []
-    for ext in ("*.json", "*.yaml", "*.yml"):
-        files.extend(sorted((GRAPHS_DIR).glob(ext)))
-    files = [p for p in files if p.stem not in ("index",)]
+    # um arquivo por grafo; o JSON tem precedência sobre a cópia YAML
+    files: List[Path] = list_structured_files(GRAPHS_DIR)
 
+    # Passada única: cada grafo é montado uma vez; cenários consultam o cache.
+    # Operadores L já persistidos (e atualizados) em OPERATORS_DIR evitam reler o grafo;
+    # os montados aqui são persistidos para as próximas execuções.
+    # Grafos vazios (sem nós/arestas) não entram no cache.
+    # O operador é gravado sob o id do grafo (graph.id ou stem), como em compute_spectrum:
+    # o atalho pelo stem só vale para operadores gravados a partir deste mesmo arquivo
+    # ("source"); se o id diferir do stem, relê o grafo para resolver o id e tenta de novo.
     graphs_cache: Dict[str, Dict[str, Any]] = {}
-
-    def load_graph(gid: str) -> Tuple[sp.csr_matrix, sp.csr_matrix, Dict[str, int], Dict[str, Any]]:
-        if gid in graphs_cache:
-            g = graphs_cache[gid]
-            return g["L"], g["B"], g["idx"], g["meta"]
-        # procurar arquivo correspondente
-        for p in files:
+    for p in files:
+        cached = _load_cached_operator(p.stem, p, require_source=True)
+        this_id = p.stem
+        if cached is None:
             data = _load_graph_serial(p)
-            meta = data.get("graph", {})
-            this_id = meta.get("id") or p.stem
-            if this_id == gid:
-                L, B, idx, meta = _serial_to_laplacian_incidence(data)
-                graphs_cache[gid] = {"L": L, "B": B, "idx": idx, "meta": meta}
-                return L, B, idx, meta
-        raise FileNotFoundError(f"Grafo com id '{gid}' não encontrado.")
+            this_id = data.get("graph", {}).get("id") or p.stem
+            if this_id in graphs_cache:
+                continue
+            cached = _load_cached_operator(this_id, p)
+        if this_id in graphs_cache:
+            continue
+        if cached is not None:
+            L, idx, meta = cached
+            graphs_cache[this_id] = {"L": L, "idx": idx, "meta": meta}
+            continue
+        try:
+            L, idx, meta = _serial_to_laplacian(data)
+        except ValueError:
+            continue
+        graphs_cache[this_id] = {"L": L, "idx": idx, "meta": meta}
+        _save_operator(this_id, L, idx, meta, p.name)
+
+    def load_graph(gid: str) -> Tuple[sp.csr_matrix, Dict[str, int], Dict[str, Any]]:
+        g = graphs_cache.get(gid)
+        if g is None:
+            raise FileNotFoundError(f"Grafo com id '{gid}' não encontrado.")
+        return g["L"], g["idx"], g["meta"]
 
     scenarios: List[Dict[str, Any]] = []
     if config_path is not None:
@@ -140,51 +362,49 @@ def compute_fenchel_energies(config_path: str | Path | None = None) -> Dict[str,
 
     # Se não houver cenários, criamos cenários padrão: para cada grafo, selecionar pares de nós extremos aleatórios
     if not scenarios:
-        for p in files:
-            data = _load_graph_serial(p)
-            L, B, idx, meta = _serial_to_laplacian_incidence(data)
-            gid = meta.get("id") or p.stem
-            nodes = list(idx.keys())
-            if len(nodes) < 2:
+        # L/idx já estão em graphs_cache (montados uma única vez acima); aqui só
+        # escolhemos os extremos, sem copiar a lista de nós de cada grafo
+        for gid, g in graphs_cache.items():
+            idx = g["idx"]
+            if len(idx) < 2:
                 continue
             # Cenário padrão: injetar +1 no primeiro nó e -1 no último
             scenarios.append({
                 "graph_id": gid,
                 "sources": [
-                    {"node": nodes[0], "injection": 1.0},
-                    {"node": nodes[-1], "injection": -1.0},
+                    {"node": next(iter(idx)), "injection": 1.0},
+                    {"node": next(reversed(idx)), "injection": -1.0},
                 ]
             })
 
     out_dir = ensure_dir(RESULTS_DIR / "fenchel_energy")
-    results: List[Dict[str, Any]] = []
 
-    for sc in scenarios:
-        gid = sc["graph_id"]
-        sources = sc.get("sources", [])
-        L, B, idx, meta = load_graph(gid)
-        b = _build_rhs_from_sources(idx, sources)
-        # checagem de balanceamento: soma deve ser zero
-        total = float(np.sum(b))
-        if abs(total) > 1e-10:
-            # Corrigir removendo média (tornar soma zero)
-            n = len(b)
-            b = b - total / n
+    # Agrupa cenários por graph_id (preservando a posição original de cada um):
+    # cada grupo fatora L uma vez e resolve todos os seus cenários.
+    groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    for pos, sc in enumerate(scenarios):
+        groups.setdefault(sc["graph_id"], []).append((pos, sc))
+    tasks = []
+    for gid, group in groups.items():
+        L, idx, meta = load_graph(gid)
+        tasks.append((gid, L, idx, meta, group))
 
-        energy = _fenchel_energy_quadratic(L, b)
-        payload = {
-            "graph_id": gid,
-            "rho": float(meta.get("rho", 1.0)),
-            "n": int(L.shape[0]),
-            "sources": sources,
-            "energy": float(energy),
-        }
-        write_json(out_dir / f"{gid}.json", payload, indent=2)
-        write_yaml(out_dir / f"{gid}.yaml", payload)
-        results.append(payload)
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            solved = list(ex.map(_solve_group, *zip(*tasks)))
+    else:
+        solved = [_solve_group(*t) for t in tasks]
+
+    # gravação serializada no processo principal, na ordem original dos cenários
+    by_pos = dict(chain.from_iterable(solved))
+    results: List[Dict[str, Any]] = [by_pos[pos] for pos in range(len(scenarios))]
+    for payload in results:
+        write_payload(out_dir / payload["graph_id"], payload, save_formats)
 
     write_json(RESULTS_DIR / "fenchel_energy_index.json", {"results": results}, indent=2)
-    write_yaml(RESULTS_DIR / "fenchel_energy_index.yaml", {"results": results})
+    if "yaml" in save_formats:
+        write_yaml_index(RESULTS_DIR / "fenchel_energy_index.yaml", {"results": results})
     return {"results": results}
 
 if __name__ == "__main__":
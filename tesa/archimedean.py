@@ -27,7 +27,8 @@
 # =============================================================================
 
 from typing import Dict, Any, Optional, Sequence
-import math
+
+import numpy as np
 
 
 def check_mean_zero(samples: Optional[Sequence[float]], atol: float = 1e-9) -> Dict[str, Any]:
@@ -44,11 +45,11 @@ def check_mean_zero(samples: Optional[Sequence[float]], atol: float = 1e-9) -> D
             "atol": atol,
             "notes": "Sem amostras fornecidas; assumindo normalização correta."
         }
-    n = len(samples)
-    mean = sum(samples) / float(n)
-    # variância populacional simples
-    var = sum((x - mean) ** 2 for x in samples) / float(n)
-    std = math.sqrt(var)
+    arr = np.asarray(samples, dtype=np.float64)
+    n = int(arr.size)
+    mean = float(arr.mean())
+    # desvio-padrão populacional simples (ddof=0)
+    std = float(arr.std())
     mean_zero_ok = abs(mean) <= float(atol)
     return {
         "mean": mean,
@@ -68,7 +69,7 @@ def estimate_sup_norm(samples: Optional[Sequence[float]]) -> Optional[float]:
     if samples is None or len(samples) == 0:
         return None
     # sup de |x|
-    return max(abs(x) for x in samples)
+    return float(np.abs(np.asarray(samples, dtype=np.float64)).max())
 
 
 def assemble_arch_report(
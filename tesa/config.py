@@ -64,11 +64,21 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 }
 
 
+# Snapshot JSON de DEFAULT_CONFIG (dados simples): decodificar é bem mais rápido que deepcopy.
+# Se algum valor não for serializável em JSON, recai em deepcopy.
+try:
+    _DEFAULT_JSON: Optional[str] = json.dumps(DEFAULT_CONFIG)
+except TypeError:
+    _DEFAULT_JSON = None
+
+
 def get_default_config() -> Dict[str, Any]:
     """
-    Retorna uma cópia rasa da configuração padrão.
+    Retorna uma cópia profunda da configuração padrão.
     """
     # Retornar cópia para evitar mutações externas
+    if _DEFAULT_JSON is not None:
+        return json.loads(_DEFAULT_JSON)
     import copy
     return copy.deepcopy(DEFAULT_CONFIG)
 
@@ -76,14 +86,17 @@ def get_default_config() -> Dict[str, Any]:
 def deep_update(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
     """
     Atualiza 'base' recursivamente com chaves de 'override' e retorna 'base'.
-    - Dicionários são mergidos recursivamente;
+    - Dicionários são mergidos recursivamente (pilha explícita, sem recursão);
     - Tipos escalares/listas substituem diretamente.
     """
-    for k, v in override.items():
-        if isinstance(v, dict) and isinstance(base.get(k), dict):
-            deep_update(base[k], v)
-        else:
-            base[k] = v
+    stack = [(base, override)]
+    while stack:
+        b, o = stack.pop()
+        for k, v in o.items():
+            if isinstance(v, dict) and isinstance(b.get(k), dict):
+                stack.append((b[k], v))
+            else:
+                b[k] = v
     return base
 
 
@@ -146,10 +159,12 @@ def apply_env_overrides(cfg: Dict[str, Any], prefix: str = "TESA_") -> Dict[str,
         exceto números que permanecem números de índice (não aplicamos aqui).
       - Usa navegação/ criação de dicionários se necessário.
     """
+    # Filtra as variáveis relevantes de uma vez; sem nenhuma, retorna cedo
+    relevant = [(k, v) for k, v in os.environ.items() if k.startswith(prefix)]
+    if not relevant:
+        return cfg
     plen = len(prefix)
-    for env_k, env_v in os.environ.items():
-        if not env_k.startswith(prefix):
-            continue
+    for env_k, env_v in relevant:
         path_keys = env_k[plen:].split("_")
         # caminho de chaves em minúsculas
         keys = [k.lower() for k in path_keys if k]
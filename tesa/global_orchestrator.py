@@ -20,6 +20,7 @@
 # =============================================================================
 
 from typing import List, Dict, Any
+import io
 import os
 
 
@@ -44,42 +45,41 @@ def summarize_global(info: Dict[str, Any], local_results: List[Dict[str, Any]])
     """
     Retorna um relatório textual consolidado do resultado global e dos locais.
     """
-    lines = []
-    lines.append("=== TESA — Relatório Global ===")
-    lines.append(f"g: {info.get('inputs', {}).get('g', '?')}")
-    lines.append(f"delta (Axioma 2): {info.get('delta')}")
-    lines.append(f"Soma C_Type: {info.get('C_types_sum')}")
-    lines.append(f"C_infty: {info.get('C_infty')}")
-    lines.append(f"C_Global: {info.get('C_global')}")
-    lines.append("— Certificados e relatórios —")
-    lines.append(f"delta_certificate: {info.get('delta_certificate')}")
-    lines.append(f"C_infty_report: {info.get('C_infty_report')}")
-    # Resumo local por lugar (se houver 'place' e 'name')
-    lines.append("— Locais —")
+    inputs = info.get("inputs", {})
+    buf = io.StringIO()
+    buf.write(
+        "=== TESA — Relatório Global ===\n"
+        f"g: {inputs.get('g', '?')}\n"
+        f"delta (Axioma 2): {info.get('delta')}\n"
+        f"Soma C_Type: {info.get('C_types_sum')}\n"
+        f"C_infty: {info.get('C_infty')}\n"
+        f"C_Global: {info.get('C_global')}\n"
+        "— Certificados e relatórios —\n"
+        f"delta_certificate: {info.get('delta_certificate')}\n"
+        f"C_infty_report: {info.get('C_infty_report')}\n"
+    )
+    # Resumo local por lugar (se houver 'place' e 'name'): uma linha por resultado,
+    # escrita direto no buffer
+    buf.write("— Locais —\n")
     if not local_results:
-        lines.append("(sem resultados locais)")
+        buf.write("(sem resultados locais)\n")
     else:
-        lines.append("place | name | i0 | c | K_v | f_v^tame | f_v | E_fenchel | C_Type | n")
+        buf.write("place | name | i0 | c | K_v | f_v^tame | f_v | E_fenchel | C_Type | n\n")
         for r in local_results:
-            place = r.get("place", "?")
-            name = r.get("name", "?")
-            i0 = r.get("i0", "?")
-            c = r.get("conductance", "?")
-            Kv = r.get("K_v", "?")
-            ft = r.get("f_v_tame", "?")
-            fv = r.get("f_v", "?")
-            Ef = r.get("E_fenchel", "?")
-            Ct = r.get("C_type", "?")
-            n = r.get("n", "?")
-            lines.append(f"{place} | {name} | {i0} | {c} | {Kv} | {ft} | {fv} | {Ef} | {Ct} | {n}")
+            g = r.get
+            buf.write(
+                f"{g('place', '?')} | {g('name', '?')} | {g('i0', '?')} | {g('conductance', '?')} | "
+                f"{g('K_v', '?')} | {g('f_v_tame', '?')} | {g('f_v', '?')} | {g('E_fenchel', '?')} | "
+                f"{g('C_type', '?')} | {g('n', '?')}\n"
+            )
     # Parâmetros de entrada relevantes
-    eps = info.get("inputs", {}).get("epsilon_params", {})
-    err_sum = info.get("inputs", {}).get("err_locals_sum", 0.0)
-    lines.append("— Parâmetros —")
-    lines.append(f"epsilon_params: {eps}")
-    lines.append(f"err_locals_sum: {err_sum}")
-    lines.append("=== Fim do Relatório ===")
-    return "\n".join(lines)
+    buf.write(
+        "— Parâmetros —\n"
+        f"epsilon_params: {inputs.get('epsilon_params', {})}\n"
+        f"err_locals_sum: {inputs.get('err_locals_sum', 0.0)}\n"
+        "=== Fim do Relatório ==="
+    )
+    return buf.getvalue()
 
 
 def save_summary_txt(report: str, out_path: str = "outputs/global_report.txt") -> str:
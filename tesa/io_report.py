@@ -18,6 +18,7 @@
 # - export_locals_csv(local_results, path) -> str
 # - plot_local_constants(local_results, path, title=None) -> Optional[str]
 # - summarize_locals(local_results) -> dict
+# - LocalResultsSoA.from_dicts(local_results) -> visão colunar (aceita pelas funções acima)
 # - write_text_report(text, path) -> str
 # - compose_text_report_global(info, local_results) -> str
 #
@@ -25,12 +26,25 @@
 # - MIT
 # =============================================================================
 
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import atexit
 import os
 import csv
 import json
-import math
 import datetime
+import io
+import math
+from operator import itemgetter
+
+import numpy as np
+
+# orjson é opcional: serialização/parse mais rápidos direto em bytes; fallback para json.
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
 
 
 def ensure_dir(path: str) -> None:
@@ -42,60 +56,207 @@ def ensure_dir(path: str) -> None:
         os.makedirs(d, exist_ok=True)
 
 
+def _has_non_finite(obj: Any) -> bool:
+    """
+    True se 'obj' contém float NaN/±inf (também em escalares/arrays numpy).
+    """
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, (float, np.floating)):
+            if not math.isfinite(x):
+                return True
+        elif isinstance(x, dict):
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple)):
+            stack.extend(x)
+        elif isinstance(x, np.ndarray) and x.dtype.kind in "fc":
+            if not np.isfinite(x).all():
+                return True
+    return False
+
+
+def _json_default(x: Any) -> Any:
+    """
+    Tipos numpy para o json padrão (o caminho orjson já os serializa nativamente).
+    """
+    if isinstance(x, np.ndarray):
+        return x.tolist()
+    if isinstance(x, np.generic):
+        return x.item()
+    raise TypeError(f"Objeto do tipo {type(x).__name__} não é serializável em JSON")
+
+
 def save_json(data: Union[Dict[str, Any], List[Any]], path: str, indent: int = 2) -> str:
     """
     Salva dados em JSON com indentação opcional e UTF-8.
+    Com orjson, indent > 0 vira indentação de 2 espaços (única suportada).
+    Dados com NaN/±inf (que o orjson gravaria como null) ou inteiros além de 64 bits
+    vão para o json padrão, que os grava como NaN/Infinity, como antes.
+    A escrita é atômica (arquivo temporário + os.replace).
     Retorna o caminho salvo.
     """
     ensure_dir(path)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=indent)
+    buf = None
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            buf = orjson.dumps(data, option=option)
+        except (orjson.JSONEncodeError, TypeError):
+            buf = None  # tipos não suportados pelo orjson: cai no json padrão
+        if buf is not None and b"null" in buf and _has_non_finite(data):
+            buf = None  # só varre quando a saída tem null (onde NaN/inf teriam ido parar)
+    if buf is None:
+        buf = json.dumps(data, ensure_ascii=False, indent=indent, default=_json_default).encode("utf-8")
+    _write_bytes_atomic(path, buf)
     return path
 
 
+def _write_bytes_atomic(path: str, buf: bytes) -> None:
+    """
+    Grava bytes já codificados em path + ".tmp" com os.write (sem camada de texto)
+    e troca atomicamente por os.replace; o temporário é removido em caso de falha.
+    """
+    tmp = path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            view = memoryview(buf)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def load_json(path: str) -> Optional[Union[Dict[str, Any], List[Any]]]:
     """
     Carrega JSON de 'path'. Retorna None se falhar.
+    NaN/Infinity e inteiros além de 64 bits (rejeitados pelo orjson) são relidos com json.
     """
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            buf = f.read()
+        if orjson is not None:
+            try:
+                return orjson.loads(buf)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(buf)
     except Exception:
         return None
 
 
-def export_locals_csv(local_results: List[Dict[str, Any]], path: str) -> str:
+def _as_float(x: Any) -> float:
+    try:
+        return float(x)
+    except Exception:
+        return 0.0
+
+
+LOCAL_DEFAULT_COLS = [
+    "place", "name", "i0", "conductance", "K_v",
+    "f_v_tame", "f_v", "E_fenchel", "C_type", "n"
+]
+
+# Marca de campo ausente num registro (distinto de None/"")
+_MISSING = object()
+
+
+@dataclass
+class LocalResultsSoA:
+    """
+    Resultados locais em layout colunar (SoA): uma lista de valores crus por campo,
+    na ordem de colunas do CSV (padrão primeiro, extras na ordem em que aparecem).
+    Colunas numéricas (float64) são derivadas sob demanda e memoizadas em numeric().
     """
-    Exporta resultados locais em CSV.
+    fields: List[str]
+    columns: Dict[str, List[Any]]
+    _numeric: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_dicts(cls, local_results: Sequence[Dict[str, Any]]) -> "LocalResultsSoA":
+        # Extras numa única passada, deduplicados pela ordem de inserção do dict
+        default_set = set(LOCAL_DEFAULT_COLS)
+        seen: Dict[str, None] = {}
+        for r in local_results:
+            for k in r:
+                if k not in default_set and k not in seen:
+                    seen[k] = None
+        fields = LOCAL_DEFAULT_COLS + list(seen)
+        columns = {k: [r.get(k, _MISSING) for r in local_results] for k in fields}
+        return cls(fields, columns)
+
+    def __len__(self) -> int:
+        return len(self.columns[self.fields[0]]) if self.fields else 0
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [
+            {k: v for k, v in zip(self.fields, row) if v is not _MISSING}
+            for row in zip(*(self.columns[k] for k in self.fields))
+        ]
+
+    def numeric(self, key: str) -> np.ndarray:
+        # Coluna como float64; ausentes/não numéricos viram 0.0
+        arr = self._numeric.get(key)
+        if arr is None:
+            col = self.columns.get(key) or [_MISSING] * len(self)
+            arr = np.fromiter((_as_float(v) for v in col), dtype=np.float64, count=len(col))
+            self._numeric[key] = arr
+        return arr
+
+    @property
+    def C_type(self) -> np.ndarray:
+        return self.numeric("C_type")
+
+    def column_or(self, key: str, default: Any) -> List[Any]:
+        # Valores crus da coluna, com 'default' no lugar de ausentes
+        return [default if v is _MISSING else v for v in self.columns.get(key, [_MISSING] * len(self))]
+
+
+def _as_soa(local_results: Union[Sequence[Dict[str, Any]], LocalResultsSoA]) -> LocalResultsSoA:
+    if isinstance(local_results, LocalResultsSoA):
+        return local_results
+    return LocalResultsSoA.from_dicts(local_results)
+
+
+def export_locals_csv(local_results: Union[List[Dict[str, Any]], LocalResultsSoA], path: str) -> str:
+    """
+    Exporta resultados locais em CSV (lista de dicts ou LocalResultsSoA).
     Colunas padrão (se existirem): place,name,i0,conductance,K_v,f_v_tame,f_v,E_fenchel,C_Type,n
     Outras chaves são preservadas, mas a ordem das padrão vem primeiro.
     """
     ensure_dir(path)
-    default_cols = [
-        "place", "name", "i0", "conductance", "K_v",
-        "f_v_tame", "f_v", "E_fenchel", "C_type", "n"
-    ]
-
-    # Descobrir chaves extras
-    extra_keys = set()
-    for r in local_results:
-        extra_keys.update(r.keys())
-    # Remover duplicadas das padrão e manter ordem
-    extra_cols = [k for k in sorted(extra_keys) if k not in default_cols]
-
-    fieldnames = default_cols + extra_cols
-
-    with open(path, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in local_results:
-            row = {}
-            for k in fieldnames:
-                row[k] = r.get(k, "")
-            writer.writerow(row)
+    soa = _as_soa(local_results)
+
+    # csv.writer sobre as colunas transpostas (zip) e buffer de escrita grande
+    # para agrupar as gravações
+    with open(path, "w", newline="", encoding="utf-8", buffering=1 << 20) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(soa.fields)
+        writer.writerows(zip(*(soa.column_or(k, "") for k in soa.fields)))
     return path
 
 
+def _locals_csv_bytes(soa: LocalResultsSoA) -> bytes:
+    """
+    Mesmo conteúdo de export_locals_csv, montado em memória (bytes UTF-8).
+    """
+    sio = io.StringIO(newline="")
+    writer = csv.writer(sio)
+    writer.writerow(soa.fields)
+    writer.writerows(zip(*(soa.column_or(k, "") for k in soa.fields)))
+    return sio.getvalue().encode("utf-8")
+
+
 def try_import_matplotlib():
     """
     Tenta importar matplotlib de forma segura.
@@ -108,8 +269,24 @@ def try_import_matplotlib():
         return None, False
 
 
+# Figura única reaproveitada entre chamadas (fechada só ao fim do processo)
+_FIG_CACHE: Optional[Tuple[Any, Any]] = None
+
+
+def _get_fig(plt, figsize: Tuple[float, float]):
+    global _FIG_CACHE
+    if _FIG_CACHE is None:
+        fig, ax = plt.subplots(figsize=figsize)
+        atexit.register(plt.close, fig)
+        _FIG_CACHE = (fig, ax)
+    fig, ax = _FIG_CACHE
+    ax.clear()
+    fig.set_size_inches(*figsize)
+    return fig, ax
+
+
 def plot_local_constants(
-    local_results: List[Dict[str, Any]],
+    local_results: Union[List[Dict[str, Any]], LocalResultsSoA],
     path: str,
     title: Optional[str] = None
 ) -> Optional[str]:
@@ -124,21 +301,13 @@ def plot_local_constants(
 
     ensure_dir(path)
 
-    # Preparar dados
-    labels = []
-    values = []
-    for idx, r in enumerate(local_results):
-        place = str(r.get("place", idx))
-        ctype = r.get("C_type", None)
-        try:
-            val = float(ctype) if ctype is not None else 0.0
-        except Exception:
-            val = 0.0
-        labels.append(place)
-        values.append(val)
+    # Preparar dados: coluna C_type já numérica; rótulo = place ou índice
+    soa = _as_soa(local_results)
+    values = soa.C_type
+    labels = [str(idx if v is _MISSING else v) for idx, v in enumerate(soa.columns["place"])]
 
     # Plot
-    fig, ax = plt.subplots(figsize=(max(6, min(12, 0.6 * max(3, len(values)))), 4))
+    fig, ax = _get_fig(plt, (max(6, min(12, 0.6 * max(3, len(values)))), 4))
     ax.bar(range(len(values)), values, color="#3B82F6")
     ax.set_xlabel("place")
     ax.set_ylabel("C_type")
@@ -153,108 +322,127 @@ def plot_local_constants(
         ax.set_xticklabels(labels, rotation=45, ha="right")
     ax.grid(axis="y", linestyle="--", alpha=0.3)
 
-    plt.tight_layout()
+    fig.tight_layout()
     fig.savefig(path, dpi=150)
-    plt.close(fig)
     return path
 
 
-def summarize_locals(local_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+def summarize_locals(local_results: Union[List[Dict[str, Any]], LocalResultsSoA]) -> Dict[str, Any]:
     """
     Calcula estatísticas simples sobre os C_type locais:
       - n, soma, média, desvio padrão, min, max; e top_k índices (por magnitude).
     """
-    vals: List[float] = []
-    for r in local_results:
-        try:
-            vals.append(float(r.get("C_type", 0.0)))
-        except Exception:
-            vals.append(0.0)
-    n = len(vals)
-    s = sum(vals)
-    mean = s / n if n > 0 else 0.0
-    var = sum((x - mean) ** 2 for x in vals) / n if n > 0 else 0.0
-    std = math.sqrt(var)
-    vmin = min(vals) if n > 0 else 0.0
-    vmax = max(vals) if n > 0 else 0.0
-
-    # top contribuintes por valor absoluto
-    indexed = list(enumerate(vals))
-    indexed.sort(key=lambda t: abs(t[1]), reverse=True)
-    top_k = indexed[: min(10, len(indexed))]
+    if isinstance(local_results, LocalResultsSoA):
+        vals = local_results.C_type
+    else:
+        vals = np.fromiter((_as_float(r.get("C_type", 0.0)) for r in local_results), dtype=np.float64, count=len(local_results))
+    n = int(vals.size)
+    if n == 0:
+        return {
+            "n": 0, "sum": 0.0, "mean": 0.0, "std": 0.0, "min": 0.0, "max": 0.0,
+            "top_k_indices": [], "top_k_values": [],
+        }
+
+    # top contribuintes por valor absoluto: argpartition (O(n)) escolhe o limiar do k-ésimo;
+    # empates no limiar entram todos e a ordenação estável preserva a ordem original.
+    k = min(10, n)
+    mag = np.abs(vals)
+    if k < n:
+        thresh = mag[np.argpartition(-mag, k - 1)[k - 1]]
+        cand = np.flatnonzero(mag >= thresh)
+    else:
+        cand = np.arange(n)
+    top = cand[np.argsort(-mag[cand], kind="stable")[:k]]
 
     return {
         "n": n,
-        "sum": s,
-        "mean": mean,
-        "std": std,
-        "min": vmin,
-        "max": vmax,
-        "top_k_indices": [i for i, _ in top_k],
-        "top_k_values": [v for _, v in top_k],
+        "sum": vals.sum().item(),
+        "mean": vals.mean().item(),
+        "std": vals.std().item(),
+        "min": vals.min().item(),
+        "max": vals.max().item(),
+        "top_k_indices": top.tolist(),
+        "top_k_values": vals[top].tolist(),
     }
 
 
-def compose_text_report_global(info: Dict[str, Any], local_results: List[Dict[str, Any]]) -> str:
+_REPORT_ROW_COLS = ("place", "name", "i0", "conductance", "K_v", "f_v_tame", "f_v", "E_fenchel", "C_type", "n")
+_REPORT_ROW_GET = itemgetter(*_REPORT_ROW_COLS)
+
+
+def _report_row_values(r: Dict[str, Any]) -> Tuple[Any, ...]:
+    # itemgetter lê os 10 campos numa chamada; registros incompletos caem no r.get
+    try:
+        return _REPORT_ROW_GET(r)
+    except KeyError:
+        return tuple(r.get(k, "?") for k in _REPORT_ROW_COLS)
+
+
+def _compose_report_bytes(info: Dict[str, Any], local_results: Union[List[Dict[str, Any]], LocalResultsSoA]) -> bytes:
     """
-    Constrói um relatório textual simples e auto-contido para o nível global.
-    Compatível com o formato de summarize_global do orquestrador.
+    Monta o relatório global direto num buffer de bytes UTF-8 (uma passada, sem lista
+    intermediária de linhas); base de compose_text_report_global e quick_bundle_outputs.
     """
-    lines: List[str] = []
+    buf = io.BytesIO()
+    w = buf.write
+    inputs = info.get("inputs", {})
     now = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%SZ")
-    lines.append("=== TESA — Relatório Global (io_report) ===")
-    lines.append(f"timestamp_utc: {now}")
-    g = info.get("inputs", {}).get("g", "?")
-    lines.append(f"g: {g}")
-    lines.append(f"delta (Axioma 2): {info.get('delta')}")
-    lines.append(f"Soma C_Type: {info.get('C_types_sum')}")
-    lines.append(f"C_infty: {info.get('C_infty')}")
-    lines.append(f"C_Global: {info.get('C_global')}")
-    lines.append("— Certificados e relatórios —")
-    lines.append(f"delta_certificate: {info.get('delta_certificate')}")
-    lines.append(f"C_infty_report: {info.get('C_infty_report')}")
-    lines.append("— Locais —")
-    if not local_results:
-        lines.append("(sem resultados locais)")
+    w((
+        "=== TESA — Relatório Global (io_report) ===\n"
+        f"timestamp_utc: {now}\n"
+        f"g: {inputs.get('g', '?')}\n"
+        f"delta (Axioma 2): {info.get('delta')}\n"
+        f"Soma C_Type: {info.get('C_types_sum')}\n"
+        f"C_infty: {info.get('C_infty')}\n"
+        f"C_Global: {info.get('C_global')}\n"
+        "— Certificados e relatórios —\n"
+        f"delta_certificate: {info.get('delta_certificate')}\n"
+        f"C_infty_report: {info.get('C_infty_report')}\n"
+        "— Locais —\n"
+    ).encode("utf-8"))
+    if not len(local_results):
+        w("(sem resultados locais)\n".encode("utf-8"))
     else:
-        lines.append("place | name | i0 | c | K_v | f_v^tame | f_v | E_fenchel | C_Type | n")
-        for r in local_results:
-            place = r.get("place", "?")
-            name = r.get("name", "?")
-            i0 = r.get("i0", "?")
-            c = r.get("conductance", "?")
-            Kv = r.get("K_v", "?")
-            ft = r.get("f_v_tame", "?")
-            fv = r.get("f_v", "?")
-            Ef = r.get("E_fenchel", "?")
-            Ct = r.get("C_type", "?")
-            n = r.get("n", "?")
-            lines.append(f"{place} | {name} | {i0} | {c} | {Kv} | {ft} | {fv} | {Ef} | {Ct} | {n}")
-    eps = info.get("inputs", {}).get("epsilon_params", {})
-    err_sum = info.get("inputs", {}).get("err_locals_sum", 0.0)
-    lines.append("— Parâmetros —")
-    lines.append(f"epsilon_params: {eps}")
-    lines.append(f"err_locals_sum: {err_sum}")
-    lines.append("=== Fim do Relatório ===")
-    return "\n".join(lines)
-
-
-def write_text_report(text: str, path: str) -> str:
-    """
-    Salva um relatório de texto simples em 'path'.
+        w(b"place | name | i0 | c | K_v | f_v^tame | f_v | E_fenchel | C_Type | n\n")
+        if isinstance(local_results, LocalResultsSoA):
+            rows = zip(*(local_results.column_or(k, "?") for k in _REPORT_ROW_COLS))
+        else:
+            rows = map(_report_row_values, local_results)
+        for row in rows:
+            w((" | ".join(map(str, row)) + "\n").encode("utf-8"))
+    w((
+        "— Parâmetros —\n"
+        f"epsilon_params: {inputs.get('epsilon_params', {})}\n"
+        f"err_locals_sum: {inputs.get('err_locals_sum', 0.0)}\n"
+        "=== Fim do Relatório ==="
+    ).encode("utf-8"))
+    return buf.getvalue()
+
+
+def compose_text_report_global(info: Dict[str, Any], local_results: Union[List[Dict[str, Any]], LocalResultsSoA]) -> str:
+    """
+    Constrói um relatório textual simples e auto-contido para o nível global.
+    Compatível com o formato de summarize_global do orquestrador.
+    """
+    return _compose_report_bytes(info, local_results).decode("utf-8")
+
+
+def write_text_report(text: Union[str, bytes], path: str) -> str:
+    """
+    Salva um relatório de texto simples em 'path' (str ou bytes UTF-8 já codificados).
     """
     ensure_dir(path)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(text)
+    _write_bytes_atomic(path, text if isinstance(text, bytes) else text.encode("utf-8"))
     return path
 
 
 def quick_bundle_outputs(
     info: Dict[str, Any],
-    local_results: List[Dict[str, Any]],
+    local_results: Union[List[Dict[str, Any]], LocalResultsSoA],
     out_dir: str = "outputs",
     prefix: Optional[str] = None,
-    make_plot: bool = True
+    make_plot: bool = True,
+    max_workers: int = 1
 ) -> Dict[str, Optional[str]]:
     """
     Cria rapidamente um pacote de saídas:
@@ -267,6 +455,9 @@ def quick_bundle_outputs(
       - out_dir: diretório base para salvar arquivos.
       - prefix: prefixo do nome dos arquivos (ex.: "g1"); se None, usa "tesa".
       - make_plot: se False, não tenta gerar gráfico.
+      - max_workers: threads para gravar JSON/CSV/TXT em paralelo (1 = em série);
+        o gráfico é sempre gerado na thread chamadora (backends GUI do pyplot
+        não suportam outras threads).
 
     Retorno:
       {
@@ -284,39 +475,47 @@ def quick_bundle_outputs(
         "png_plot": None,
     }
 
-    # JSON
-    try:
-        json_path = os.path.join(out_dir, f"{base}_global_info.json")
-        save_json(info, json_path)
-        out_paths["json_info"] = json_path
-    except Exception:
-        out_paths["json_info"] = None
-
-    # CSV
-    try:
-        csv_path = os.path.join(out_dir, f"{base}_locals.csv")
-        export_locals_csv(local_results, csv_path)
-        out_paths["csv_locals"] = csv_path
-    except Exception:
-        out_paths["csv_locals"] = None
-
-    # TXT
-    try:
-        text = compose_text_report_global(info, local_results)
-        txt_path = os.path.join(out_dir, f"{base}_global_report.txt")
-        write_text_report(text, txt_path)
-        out_paths["txt_report"] = txt_path
-    except Exception:
-        out_paths["txt_report"] = None
+    # CSV e gráfico compartilham uma única conversão para o layout colunar
+    soa = _as_soa(local_results)
+    json_path = os.path.join(out_dir, f"{base}_global_info.json")
+    csv_path = os.path.join(out_dir, f"{base}_locals.csv")
+    txt_path = os.path.join(out_dir, f"{base}_global_report.txt")
+    png_path = os.path.join(out_dir, f"{base}_locals_plot.png")
+
+    def write_csv() -> str:
+        ensure_dir(csv_path)
+        _write_bytes_atomic(csv_path, _locals_csv_bytes(soa))
+        return csv_path
+
+    # As saídas são independentes: cada tarefa retorna o caminho gravado (ou None).
+    # JSON, CSV e TXT são serializados em memória e gravados com um único os.write cada.
+    tasks: Dict[str, Callable[[], Optional[str]]] = {
+        "json_info": lambda: save_json(info, json_path),
+        "csv_locals": write_csv,
+        "txt_report": lambda: write_text_report(_compose_report_bytes(info, soa), txt_path),
+    }
 
-    # PNG
-    if make_plot:
+    def run(task: Callable[[], Optional[str]]) -> Optional[str]:
         try:
-            png_path = os.path.join(out_dir, f"{base}_locals_plot.png")
-            ret = plot_local_constants(local_results, png_path, title=f"{base}: C_type por lugar")
-            out_paths["png_plot"] = ret
+            return task()
         except Exception:
-            out_paths["png_plot"] = None
+            return None
+
+    def plot() -> Optional[str]:
+        return plot_local_constants(soa, png_path, title=f"{base}: C_type por lugar")
+
+    # Só as gravações vão para o pool; o PNG é renderizado aqui, enquanto elas correm
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            futures = [ex.submit(run, t) for t in tasks.values()]
+            if make_plot:
+                out_paths["png_plot"] = run(plot)
+            results = [f.result() for f in futures]
+    else:
+        results = [run(t) for t in tasks.values()]
+        if make_plot:
+            out_paths["png_plot"] = run(plot)
+    out_paths.update(zip(tasks, results))
 
     return out_paths
 
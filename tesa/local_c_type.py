@@ -16,7 +16,8 @@
 #   Substitua por grafos/estruturas oficiais quando necessário.
 #
 # Dependências (runtime):
-# - networkx (distâncias em grafos e layout para plots)
+# - networkx (layout de mola dos plots, calculado uma vez por grafo)
+# - numpy (energia de Fenchel vetorizada)
 # - matplotlib (plots)
 # - csv (exportação de resultados)
 # - math (verificações e operações básicas)
@@ -37,13 +38,37 @@
 # Licença:
 # - MIT 
 # =============================================================================
+import atexit
 import math
 import csv
-from typing import List, Tuple, Dict, Any, Optional
+import functools
+import os
+from collections import deque
+from itertools import islice
+from operator import itemgetter
+from typing import List, Tuple, Dict, Any, Optional, Sequence
 
-# Imports opcionais para plot
-import matplotlib.pyplot as plt
-import networkx as nx
+import numpy as np
+
+# matplotlib e networkx só são importados sob demanda (apenas os plots usam):
+# o caminho numérico (compute_C_type_for_graph) não paga seu custo de importação.
+_plt = None
+_nx = None
+
+def _pyplot():
+    global _plt
+    if _plt is None:
+        import matplotlib.pyplot as _plt
+    return _plt
+
+def _networkx():
+    global _nx
+    if _nx is None:
+        import networkx as _nx
+    return _nx
+
+# TESA_FAST=1 desliga as verificações de tempo de execução (varreduras de parâmetros)
+TESA_FAST = os.environ.get("TESA_FAST") == "1"
 
 # ============================================================
 # Tabela KV: penalidades locais por primo p e tipo (placeholder)
@@ -97,22 +122,20 @@ def graph_E8() -> Tuple[List[Tuple[int, int]], int, str]:
     n = 8
     return edges, n, "E8"
 
-# Mapeamento de código textual para o grafo
-def get_graph(code: str) -> Tuple[List[Tuple[int, int]], int, str]:
+# Registro imutável montado uma vez na importação: código -> (arestas, n, nome)
+_GRAPH_REGISTRY: Dict[str, Tuple[Tuple[Tuple[int, int], ...], int, str]] = {
+    name: (tuple(edges), n, name)
+    for edges, n, name in (graph_D4(), graph_D5(), graph_D6(), graph_E6(), graph_E7(), graph_E8())
+}
+
+# Mapeamento de código textual para o grafo (arestas como tupla compartilhada;
+# use list(edges) se precisar alterá-las)
+def get_graph(code: str) -> Tuple[Tuple[Tuple[int, int], ...], int, str]:
     code = code.upper().strip()
-    if code == "D4":
-        return graph_D4()
-    if code == "D5":
-        return graph_D5()
-    if code == "D6":
-        return graph_D6()
-    if code == "E6":
-        return graph_E6()
-    if code == "E7":
-        return graph_E7()
-    if code == "E8":
-        return graph_E8()
-    raise ValueError(f"Tipo de grafo desconhecido: {code}")
+    try:
+        return _GRAPH_REGISTRY[code]
+    except KeyError:
+        raise ValueError(f"Tipo de grafo desconhecido: {code}") from None
 
 # ============================================================
 # f_v^tame e f_v (placeholder)
@@ -146,12 +169,45 @@ def f_v(name: str, K_v: float, conductance: float = 1.0) -> float:
 # e correntes nas arestas J = c*(φ_u - φ_v). A energia:
 # E = 0.5 * sum_{(u,v)} c * (φ_u - φ_v)^2
 # ============================================================
-def fenchel_energy(edges: List[Tuple[int,int]], phi: List[float], conductance: float = 1.0) -> float:
+@functools.lru_cache(maxsize=None)
+def _edge_index_arrays(edges: Tuple[Tuple[int, int], ...]) -> Tuple[np.ndarray, np.ndarray]:
+    # Extremos (eu, ev) das arestas; memoizado para as tuplas do registro de grafos
+    ends = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+    return ends[:, 0], ends[:, 1]
+
+def fenchel_energy(edges: Sequence[Tuple[int,int]], phi: Sequence[float], conductance: float = 1.0) -> float:
+    # E = 0.5 c ||phi[eu] - phi[ev]||^2 (produto interno via BLAS)
     c = float(conductance)
-    e = 0.0
-    for (u, v) in edges:
-        e += 0.5 * c * (phi[u] - phi[v])**2
-    return float(e)
+    if isinstance(edges, tuple):
+        eu, ev = _edge_index_arrays(edges)
+    else:
+        ends = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+        eu, ev = ends[:, 0], ends[:, 1]
+    phi_arr = np.asarray(phi, dtype=np.float64)
+    diff = phi_arr[eu] - phi_arr[ev]
+    return 0.5 * c * float(np.dot(diff, diff))
+
+def _make_energy_kernel(name: str, edges: Sequence[Tuple[int, int]]):
+    # Gera (exec) a soma desenrolada das arestas fixas do tipo:
+    # _energy_<name>(phi, c) = 0.5*c*((phi[u]-phi[v])**2 + ...), sem laço nem NumPy
+    terms = " + ".join(f"(phi[{u}] - phi[{v}])**2" for u, v in edges) or "0.0"
+    src = f"def _energy_{name}(phi, c):\n    return 0.5 * float(c) * ({terms})\n"
+    ns: Dict[str, Any] = {}
+    exec(compile(src, f"<tesa energy kernel {name}>", "exec"), ns)
+    return ns[f"_energy_{name}"]
+
+# Núcleos especializados por tipo registrado (arestas fixas conhecidas na importação)
+_ENERGY_KERNELS: Dict[str, Any] = {
+    name: _make_energy_kernel(name, edges) for name, (edges, _, _) in _GRAPH_REGISTRY.items()
+}
+
+def _energy_for(edges: Sequence[Tuple[int,int]], name: str, phi: Sequence[float], conductance: float) -> float:
+    # Núcleo desenrolado quando as arestas são as do tipo registrado; senão, caminho geral
+    entry = _GRAPH_REGISTRY.get(name)
+    if entry is not None and (edges is entry[0] or tuple(edges) == entry[0]):
+        # núcleo desenrolado indexa escalares: lista Python é mais rápida que ndarray
+        return _ENERGY_KERNELS[name](phi.tolist() if isinstance(phi, np.ndarray) else phi, conductance)
+    return fenchel_energy(edges, phi, conductance=conductance)
 
 # ============================================================
 # Construção de potencial φ com base em i0, f_v, e posição de referência
@@ -161,33 +217,46 @@ def fenchel_energy(edges: List[Tuple[int,int]], phi: List[float], conductance: f
 # com scale proporcional a f_v.
 # ============================================================
 def shortest_path_distances(n: int, edges: List[Tuple[int,int]], ref_index: int = 0) -> List[int]:
-    G = nx.Graph()
-    G.add_nodes_from(range(n))
-    G.add_edges_from(edges)
-    d = []
-    for k in range(n):
-        try:
-            d.append(nx.shortest_path_length(G, source=ref_index, target=k))
-        except nx.NetworkXNoPath:
-            d.append(10**6)
+    # Uma única BFS a partir de ref_index em lista de adjacência (grafos pequenos:
+    # dispensa a construção de nx.Graph); nós inalcançáveis ficam com 10**6.
+    adj: List[List[int]] = [[] for _ in range(n)]
+    for u, v in edges:
+        adj[u].append(v)
+        adj[v].append(u)
+    d = [10**6] * n
+    d[ref_index] = 0
+    queue = deque([ref_index])
+    while queue:
+        u = queue.popleft()
+        du = d[u] + 1
+        for w in adj[u]:
+            if d[w] == 10**6:
+                d[w] = du
+                queue.append(w)
+    return d
+
+@functools.lru_cache(maxsize=None)
+def _cached_distances(edges: Tuple[Tuple[int, int], ...], n: int, ref_index: int) -> np.ndarray:
+    # Distâncias só dependem do grafo e da referência: uma BFS por (arestas, n, ref)
+    # serve todas as varreduras de i0 / K_v / condutância (array somente leitura)
+    d = np.asarray(shortest_path_distances(n, list(edges), ref_index=ref_index), dtype=np.float64)
+    d.flags.writeable = False
     return d
 
 def build_potential(
     n: int,
-    edges: List[Tuple[int,int]],
+    edges: Sequence[Tuple[int,int]],
     i0: int,
     f_v_value: float,
     ref_index: int = 0
-) -> List[float]:
-    dists = shortest_path_distances(n, edges, ref_index=ref_index)
-    scale = max(f_v_value, 1e-9)
-    phi = []
-    for k in range(n):
-        phi_k = (float(i0) - float(dists[k])) * scale
-        # Não permitir valores extremamente negativos para nós desconectados
-        if dists[k] >= 10**5:
-            phi_k = 0.0
-        phi.append(phi_k)
+) -> np.ndarray:
+    if isinstance(edges, tuple):
+        dists = _cached_distances(edges, n, ref_index)
+    else:
+        dists = np.asarray(shortest_path_distances(n, edges, ref_index=ref_index), dtype=np.float64)
+    phi = (float(i0) - dists) * max(f_v_value, 1e-9)
+    # Não permitir valores extremamente negativos para nós desconectados
+    phi[dists >= 10**5] = 0.0
     return phi
 
 # ============================================================
@@ -210,13 +279,13 @@ def compute_C_type_for_graph(
     fv = f_v(name, K_v=K_v, conductance=conductance)
 
     phi = build_potential(n, edges, i0=i0, f_v_value=fv, ref_index=ref_index)
-    E = fenchel_energy(edges, phi, conductance=conductance)
+    E = _energy_for(edges, name, phi, conductance)
 
     # C_Type,v := E + K_v (placeholder; pode ser outra função)
     C_type = float(E + K_v)
 
-    # Verificação simples
-    if check:
+    # Verificação simples (pulada com check=False ou TESA_FAST=1)
+    if check and not TESA_FAST:
         assert n >= 1 and len(edges) >= 1, "Grafo deve ter pelo menos 1 aresta."
         assert math.isfinite(E), "Energia não finita."
         assert math.isfinite(C_type), "C_type não finito."
@@ -236,85 +305,119 @@ def compute_C_type_for_graph(
 # ============================================================
 # Exportação CSV básica de resultados locais
 # ============================================================
-def export_results_csv(results: List[Dict[str, Any]], path: str) -> str:
-    with open(path, "w", newline="") as f:
+_RESULT_ROW = itemgetter("name", "n", "i0", "K_v", "conductance", "f_v_tame", "f_v", "E_fenchel", "C_type")
+
+def export_results_csv(results: List[Dict[str, Any]], path: str, chunksize: Optional[int] = None) -> str:
+    # writerows sobre as linhas (itemgetter); chunksize limita quantas linhas são
+    # formatadas antes de cada flush (None = todas de uma vez)
+    with open(path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
         w = csv.writer(f)
         w.writerow(["name","n","i0","K_v","conductance","f_v^tame","f_v","E_fenchel","C_Type"])
-        for r in results:
-            w.writerow([
-                r["name"], r["n"], r["i0"], r["K_v"], r["conductance"],
-                r["f_v_tame"], r["f_v"], r["E_fenchel"], r["C_type"]
-            ])
+        rows = map(_RESULT_ROW, results)
+        if chunksize is None:
+            w.writerows(rows)
+        else:
+            while True:
+                chunk = list(islice(rows, max(1, int(chunksize))))
+                if not chunk:
+                    break
+                w.writerows(chunk)
+                f.flush()
     return path
 
 # ============================================================
 # Plots utilitários
 # ============================================================
+# Figura única reaproveitada entre os plots (evita criar/destruir Figure a cada chamada);
+# fechada apenas ao fim do processo.
+_FIG_CACHE: Optional[Tuple[Any, Any]] = None
+
+def _get_fig(figsize: Tuple[float, float]):
+    global _FIG_CACHE
+    if _FIG_CACHE is None:
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=figsize)
+        atexit.register(plt.close, fig)
+        _FIG_CACHE = (fig, ax)
+    fig, ax = _FIG_CACHE
+    ax.clear()
+    ax.set_axis_on()
+    fig.set_size_inches(*figsize)
+    return fig, ax
+
 def plot_bar_by_i0(results: List[Dict[str, Any]], title: str = "C_Type por i0", out_path: str = "outputs/plot_bar_by_i0.png"):
     xs = [r["i0"] for r in results]
     ys = [r["C_type"] for r in results]
-    fig, ax = plt.subplots(figsize=(6.5,3.5))
+    fig, ax = _get_fig((6.5, 3.5))
     ax.bar(xs, ys, color="#4C72B0")
     ax.set_xlabel("i0")
     ax.set_ylabel("C_Type")
     ax.set_title(title)
     ax.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=140)
-    plt.close(fig)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=140)
     return out_path
 
 def plot_fv_by_type(results: List[Dict[str, Any]], title: str = "f_v por tipo", out_path: str = "outputs/plot_fv_by_type.png"):
     xs = [r["name"] for r in results]
     ys = [r["f_v"] for r in results]
-    fig, ax = plt.subplots(figsize=(6.5,3.5))
+    fig, ax = _get_fig((6.5, 3.5))
     ax.bar(xs, ys, color="#1B9E77")
     ax.set_xlabel("Tipo")
     ax.set_ylabel("f_v")
     ax.set_title(title)
     ax.grid(axis='y', alpha=0.3)
-    plt.xticks(rotation=20, ha='right')
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=140)
-    plt.close(fig)
+    _pyplot().setp(ax.get_xticklabels(), rotation=20, ha='right')
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=140)
     return out_path
 
-def plot_graph_with_values(edges: List[Tuple[int,int]], values: List[float], title: str = "Grafo e φ", out_path: str = "outputs/plot_graph.png"):
+@functools.lru_cache(maxsize=None)
+def _layout(edges: Tuple[Tuple[int, int], ...], n: int, seed: int) -> np.ndarray:
+    # Layout de mola (determinístico pela semente) calculado uma vez por grafo: (n, 2)
+    nx = _networkx()
     G = nx.Graph()
-    n = len(values)
     G.add_nodes_from(range(n))
     G.add_edges_from(edges)
-    pos = nx.spring_layout(G, seed=7)
-    fig, ax = plt.subplots(figsize=(6.5,4.5))
-    nx.draw(G, pos, with_labels=True, node_color="#E0E0E0", edge_color="#888888", node_size=600, ax=ax)
-    labels = {i: f"{i}\n{values[i]:.2f}" for i in range(n)}
-    nx.draw_networkx_labels(G, pos, labels=labels, font_size=9, ax=ax)
+    pos = nx.spring_layout(G, seed=seed)
+    return np.array([pos[i] for i in range(n)], dtype=float)
+
+def _draw_graph(ax, pos: np.ndarray, edges: Sequence[Tuple[int, int]], labels: Sequence[str],
+                node_color: str, edge_color: str, node_size: float, widths: Any = 1.0) -> None:
+    # Desenho direto em matplotlib: arestas (LineCollection), nós (scatter) e rótulos
+    from matplotlib.collections import LineCollection
+    ends = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+    ax.add_collection(LineCollection(pos[ends], colors=edge_color, linewidths=widths, zorder=1))
+    ax.scatter(pos[:, 0], pos[:, 1], s=node_size, c=node_color, zorder=2)
+    for (x, y), text in zip(pos, labels):
+        ax.text(x, y, text, ha="center", va="center", fontsize=9, zorder=3)
+    ax.autoscale_view()
+    ax.set_axis_off()
+
+def plot_graph_with_values(edges: List[Tuple[int,int]], values: List[float], title: str = "Grafo e φ", out_path: str = "outputs/plot_graph.png"):
+    n = len(values)
+    pos = _layout(tuple(map(tuple, edges)), n, 7)
+    fig, ax = _get_fig((6.5, 4.5))
+    _draw_graph(ax, pos, edges, [f"{i}\n{values[i]:.2f}" for i in range(n)],
+                node_color="#E0E0E0", edge_color="#888888", node_size=600)
     ax.set_title(title)
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=140)
-    plt.close(fig)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=140)
     return out_path
 
 def plot_edge_currents(edges: List[Tuple[int,int]], phi: List[float], conductance: float = 1.0, title: str = "Correntes nas arestas", out_path: str = "outputs/plot_edge_currents.png"):
-    G = nx.Graph()
     n = len(phi)
-    G.add_nodes_from(range(n))
-    G.add_edges_from(edges)
-    pos = nx.spring_layout(G, seed=5)
-    fig, ax = plt.subplots(figsize=(6.5,4.5))
-    nx.draw(G, pos, with_labels=True, node_color="#FAFAFA", edge_color="#999999", node_size=650, ax=ax)
-    # Corrente J = c*(φ_u - φ_v)
-    c = float(conductance)
-    widths = []
-    for (u, v) in edges:
-        j = abs(c * (phi[u] - phi[v]))
-        widths.append(1.0 + 2.0 * j)  # espessura proporcional à corrente
-    # Desenhar novamente com espessuras
-    nx.draw_networkx_edges(G, pos, edgelist=edges, width=widths, edge_color="#3778C2", ax=ax)
+    pos = _layout(tuple(map(tuple, edges)), n, 5)
+    fig, ax = _get_fig((6.5, 4.5))
+    # Corrente J = c*(φ_u - φ_v); espessura proporcional à corrente
+    ends = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+    phi_arr = np.asarray(phi, dtype=float)
+    widths = 1.0 + 2.0 * np.abs(float(conductance) * (phi_arr[ends[:, 0]] - phi_arr[ends[:, 1]]))
+    _draw_graph(ax, pos, edges, [str(i) for i in range(n)],
+                node_color="#FAFAFA", edge_color="#3778C2", node_size=650, widths=widths)
     ax.set_title(title)
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=140)
-    plt.close(fig)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=140)
     return out_path
 
 # ============================================================
@@ -322,8 +425,7 @@ def plot_edge_currents(edges: List[Tuple[int,int]], phi: List[float], conductanc
 # ============================================================
 def run_all_tests() -> List[Dict[str, Any]]:
     tests = []
-    for maker in [graph_D4, graph_D5, graph_D6, graph_E6, graph_E7, graph_E8]:
-        edges, n, name = maker()
+    for edges, n, name in _GRAPH_REGISTRY.values():
         res = compute_C_type_for_graph(edges, n, name, i0=3, K_v=KV_TABLE.get(2, {}).get(name, 0.0), conductance=1.0)
         tests.append(res)
     return tests
@@ -12,15 +12,19 @@
 #     * com clipping e relatórios de estabilidade.
 # - Utilitários:
 #     * estimate_spectral_gap: computa "gap" mínimo de uma matriz Laplaciana
-#       (segunda menor autovalor de um Laplaciano não normalizado).
-#     * normalize_delta: normaliza δ para o intervalo [0, 1) com tolerância.
+#       (segunda menor autovalor de um Laplaciano não normalizado);
+#       variantes estimate_spectral_gap_dense (ndarray) e _sparse (scipy.sparse).
+#     * normalize_delta: normaliza δ para o intervalo [0, 1) com tolerância;
+#       normalize_delta_array faz o mesmo para vetores de δ.
 #     * assemble_delta_certificate: cria certificado auditável do δ.
 #
 # Como evoluir:
 # - Integrar operadores de Laplaciano contínuo/hiperbólico, Núcleo de Green,
 #   e certificados rigorosos (interval arithmetic).
-# - Conectar com bibliotecas numéricas quando permitido (scipy.sparse.linalg),
-#   mantendo fallback puro-Python com Rayleigh quotients para matrizes pequenas.
+# - scipy.sparse.linalg (eigsh) já é usado quando disponível; sem scipy, o fallback
+#   é iteração de potência em NumPy (_power_gap). A antiga sonda por eixos
+#   (vetores e_k − 1/n) não estimava λ2: para Laplacianos (linhas somam 0) o
+#   quociente de Rayleigh de cada sonda reduz-se a L[k,k]/(1 − 1/n), i.e. a diag(L).
 #
 # API estável esperada pelo orquestrador:
 #   compute_delta(g: int, family_data: dict) -> dict
@@ -30,8 +34,16 @@
 # - MIT
 # =============================================================================
 
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Sequence, Tuple
+import copy
+import hashlib
+import json
 import math
+import sys
+import warnings
+
+import numpy as np
 
 
 def normalize_delta(value: float, eps: float = 1e-12) -> float:
@@ -39,87 +51,328 @@ def normalize_delta(value: float, eps: float = 1e-12) -> float:
     Normaliza δ para o intervalo [0, 1) com margem de segurança.
     Clipa negativos para 0.0 e valores >= 1 - eps para 1 - eps.
     """
-    if math.isnan(value) or math.isinf(value):
+    if not math.isfinite(value):
         return 0.0
     v = float(value)
-    if v < 0.0:
-        return 0.0
     upper = 1.0 - float(eps)
-    if v >= upper:
-        return upper
-    return v
+    return 0.0 if v < 0.0 else (upper if v >= upper else v)
+
+
+def normalize_delta_array(arr: Any, eps: float = 1e-12) -> np.ndarray:
+    """
+    Versão vetorizada de normalize_delta: mesma regra elemento a elemento
+    (NaN/±inf -> 0.0; clipping em [0, 1 - eps]) numa única passada de ufuncs.
+    """
+    v = np.asarray(arr, dtype=np.float64)
+    out = np.where(np.isfinite(v), v, 0.0)
+    np.clip(out, 0.0, 1.0 - float(eps), out=out)
+    return out
+
+
+# Ordem padrão do filtro de Chebyshev no fallback sem scipy (0 = potência simples)
+CHEBY_ORDER = 12
+
+
+def _power_gap(
+    L: np.ndarray,
+    maxiter: int = 2000,
+    tol: float = 1e-10,
+    cheby_order: int = CHEBY_ORDER,
+    return_vector: bool = False
+) -> Any:
+    """
+    λ2 sem scipy, por iteração de potência:
+      1) potência em L (projetada no ortogonal às constantes) estima λ_max;
+      2) no mesmo subespaço, iteração filtrada por Chebyshev: T_m((L − c)/e) amortece
+         [a, s] (s ≥ λ_max) e amplifica o extremo inferior; a acompanha o quociente de
+         Rayleigh r (a = (r + s)/2), reduzindo as iterações de O(κ) para ~O(√κ).
+         Com cheby_order = 0: potência em M = s·I − L e λ2 = s − r.
+    s = min(1.01·λ_max estimado, cota de Gershgorin).
+    Cada iteração faz um único produto L·v, reaproveitado pelo quociente de Rayleigh
+    e pelo passo seguinte. Com return_vector=True devolve (λ2, v2), sendo v2 o vetor
+    unitário convergido (aproximação do vetor de Fiedler).
+    """
+    n = L.shape[0]
+    rng = np.random.default_rng(0)
+    fdtype = L.dtype if np.issubdtype(L.dtype, np.floating) else np.float64
+    tol = max(tol, 10.0 * float(np.finfo(fdtype).eps))  # fp32: não exige 1e-10
+
+    def start() -> np.ndarray:
+        return rng.standard_normal(n).astype(fdtype, copy=False)
+
+    def run(step, v: np.ndarray) -> Tuple[float, np.ndarray]:
+        # devolve o quociente de Rayleigh de L e o vetor convergido
+        r_prev = np.inf
+        r = 0.0
+        for _ in range(maxiter):
+            v -= v.mean()
+            nv = np.linalg.norm(v)
+            if nv == 0.0:
+                return 0.0, v
+            v /= nv
+            Lv = L @ v
+            r = float(v @ Lv)
+            if abs(r - r_prev) <= tol * max(1.0, abs(r)):
+                break
+            r_prev = r
+            v = step(v, Lv, r)
+        return r, v
+
+    def done(r: float, v: np.ndarray) -> Any:
+        lam2 = float(max(0.0, r))
+        return (lam2, v) if return_vector else lam2
+
+    lam_max, v_max = run(lambda x, Lx, r: Lx, start())
+    gersh = float(np.asarray(abs(L).sum(axis=1)).max())
+    shift = min(gersh, 1.01 * lam_max) if lam_max > 0 else gersh
+    if shift <= 0.0:
+        return done(0.0, v_max)  # L nulo: qualquer vetor ortogonal às constantes serve
+
+    if cheby_order <= 0:
+        # potência em M = s·I − L; o Rayleigh de M é s − r, logo λ2 = r
+        return done(*run(lambda x, Lx, r: shift * x - Lx, start()))
+
+    def cheby_step(x: np.ndarray, Lx: np.ndarray, r: float) -> np.ndarray:
+        # T_m((L − c)/e) x pela recorrência de três termos, projetando as constantes
+        a = 0.5 * (max(r, 0.0) + shift)
+        c, e = 0.5 * (a + shift), 0.5 * (shift - a)
+        if e <= 0.0:
+            return Lx
+        y_prev, y = x, (Lx - c * x) / e
+        for _ in range(cheby_order - 1):
+            y_prev, y = y, 2.0 * (L @ y - c * y) / e - y_prev
+            y -= y.mean()
+            ny = np.linalg.norm(y)
+            if ny > 0.0:  # reescala conjunta: evita overflow sem alterar a direção
+                y_prev, y = y_prev / ny, y / ny
+        return y
+
+    return done(*run(cheby_step, start()))
+
+
+# Acima deste n (com scipy), λ2 vem de LOBPCG antes de tentar eigsh em shift-invert
+LOBPCG_THRESHOLD = 5000
+LOBPCG_TOL = 1e-6
+LOBPCG_MAXITER = 1000
+# Resíduo ||L v − λ v|| aceito, relativo ao próprio λ (λ2 pode ser ~1e-7 em grafos mal
+# conectados, bem abaixo de qualquer limiar absoluto); acima disso cai no eigsh
+LOBPCG_RESID = 1e-2
+# Deslocamento diagonal do precondicionador de Jacobi (evita 1/0 em vértices isolados)
+LOBPCG_SHIFT = 1e-5
+
+
+def _lobpcg_gap(L: Any, sp) -> Optional[Tuple[float, np.ndarray]]:
+    """
+    (λ2, v2) por LOBPCG (scipy.sparse.linalg.lobpcg): busca o menor autovalor de L
+    restrito ao ortogonal das constantes (restrição Y = 1/√n), com precondicionador
+    de Jacobi 1/(|diag(L)| + LOBPCG_SHIFT). Só produtos por blocos, sem fatoração,
+    o que evita o preenchimento do shift-invert em grafos grandes e pouco estruturados.
+    None se o resíduo relativo ||L v − λ v|| / λ passar de LOBPCG_RESID (não convergiu;
+    o chamador recorre ao eigsh).
+    """
+    try:
+        from scipy.sparse.linalg import lobpcg
+    except ImportError:
+        return None
+    n = L.shape[0]
+    d = np.abs(np.asarray(L.diagonal(), dtype=L.dtype))
+    M = sp.diags(1.0 / (d + LOBPCG_SHIFT))
+    Y = np.full((n, 1), 1.0 / math.sqrt(n), dtype=L.dtype)
+    X = np.random.default_rng(0).standard_normal((n, 1)).astype(L.dtype, copy=False)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # não convergência é tratada pelo resíduo abaixo
+            w, V = lobpcg(L, X, M=M, Y=Y, tol=LOBPCG_TOL, largest=False, maxiter=LOBPCG_MAXITER)
+    except Exception:
+        return None
+    lam, v = float(w[0]), V[:, 0]
+    resid = float(np.linalg.norm(L @ v - lam * v))
+    if not math.isfinite(resid) or resid > LOBPCG_RESID * max(abs(lam), float(np.finfo(L.dtype).tiny)):
+        return None
+    return float(max(0.0, lam)), v
+
+
+# Densidade abaixo da qual o Laplaciano é tratado em CSR (nnz < SPARSE_DENSITY · n²)
+SPARSE_DENSITY = 0.1
+
+
+def _rows_to_operator(laplacian: Sequence[Sequence[float]], sp, dtype: Any = np.float64) -> Optional[Any]:
+    """
+    Converte lista de listas em operador 'dtype', linha a linha (sem matriz densa
+    intermediária): CSR se esparso (nnz < SPARSE_DENSITY · n²), senão ndarray denso;
+    None se não quadrada. Sem scipy (sp=None), converte direto para ndarray.
+    """
+    n = len(laplacian)
+    if sp is None:
+        L = np.asarray(laplacian, dtype=dtype)
+        return L if L.ndim == 2 and L.shape == (n, n) else None
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indices: List[np.ndarray] = []
+    data: List[np.ndarray] = []
+    for i, row in enumerate(laplacian):
+        r = np.asarray(row, dtype=dtype)
+        if r.shape != (n,):
+            return None
+        nz = np.flatnonzero(r)
+        indices.append(nz)
+        data.append(r[nz])
+        indptr[i + 1] = indptr[i] + nz.size
+    L = sp.csr_matrix(
+        (np.concatenate(data) if data else np.zeros(0, dtype=dtype), np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64), indptr),
+        shape=(n, n),
+    )
+    return L if L.nnz < SPARSE_DENSITY * n * n else L.toarray()
 
 
 def estimate_spectral_gap(
-    laplacian: Sequence[Sequence[float]]
-) -> Optional[float]:
+    laplacian: Sequence[Sequence[float]],
+    cheby_order: int = CHEBY_ORDER,
+    return_vector: bool = False,
+    dtype: Any = np.float64,
+    lobpcg_threshold: int = LOBPCG_THRESHOLD
+) -> Any:
     """
     Estima a segunda menor autovalor (λ2) de um Laplaciano simétrico real.
     Requisitos:
-      - 'laplacian' é uma matriz quadrada (lista de listas) simétrica.
+      - 'laplacian' é uma matriz quadrada simétrica: lista de listas, numpy.ndarray
+        ou scipy.sparse (os dois últimos validados só pelo shape, sem varrer linhas).
       - Laplaciano não-normalizado esperado (linhas somam 0).
     Observações:
-      - Método simples e robusto para matrizes pequenas: varre subespaços
-        ortogonais ao vetor constante usando uma base canônica corrigida.
-      - Para casos maiores, substitua por um solver eigen (quando permitido).
+      - n <= 4: autovalores densos exatos (eigvalsh).
+      - Caso geral: ARPACK (scipy.sparse.linalg.eigsh) em modo shift-invert;
+        para n > 'lobpcg_threshold', tenta antes LOBPCG (_lobpcg_gap);
+        listas de listas esparsas (nnz < SPARSE_DENSITY · n²) viram CSR linha a
+        linha, e todos os produtos passam a custar O(nnz).
+      - Sem scipy: iteração de potência com filtro de Chebyshev de ordem
+        'cheby_order' (_power_gap; 0 = potência deslocada simples).
+      - dtype=np.float32 faz todo o cálculo em precisão simples (metade dos bytes
+        por produto; eigsh usa o driver ARPACK single). λ2 sai com ~6 dígitos.
     Retorna:
       - λ2 ≥ 0 se conseguir estimar; None se entrada vazia/degenerada.
+      - Com return_vector=True: (λ2, v2), com v2 o vetor de Fiedler (unitário,
+        ndarray), ou None nos mesmos casos degenerados.
     """
-    # Verificações básicas
     if laplacian is None:
         return None
-    n = len(laplacian)
-    if n == 0:
+    if isinstance(laplacian, np.ndarray):
+        return estimate_spectral_gap_dense(laplacian, cheby_order, return_vector, dtype, lobpcg_threshold)
+    sp = _scipy_sparse()
+    if sp is not None and sp.issparse(laplacian):
+        return estimate_spectral_gap_sparse(laplacian, cheby_order, return_vector, dtype, lobpcg_threshold)
+
+    # Verificações básicas e conversão única (CSR ou denso, em 'dtype')
+    try:
+        L = _rows_to_operator(laplacian, sp, dtype)
+    except (TypeError, ValueError):
+        return None  # entradas não numéricas / linhas irregulares
+    if L is None:
         return None
-    for row in laplacian:
-        if len(row) != n:
-            return None
+    return _gap_from_operator(L, cheby_order, return_vector, lobpcg_threshold)
 
-    # Funções auxiliares de álgebra linear (puro Python)
-    def dot(u: Sequence[float], v: Sequence[float]) -> float:
-        return sum(ux * vx for ux, vx in zip(u, v))
 
-    def matvec(A: Sequence[Sequence[float]], x: Sequence[float]) -> List[float]:
-        return [sum(A[i][j] * x[j] for j in range(n)) for i in range(n)]
+def estimate_spectral_gap_dense(
+    laplacian: np.ndarray,
+    cheby_order: int = CHEBY_ORDER,
+    return_vector: bool = False,
+    dtype: Any = np.float64,
+    lobpcg_threshold: int = LOBPCG_THRESHOLD
+) -> Any:
+    """
+    λ2 de um Laplaciano dado como numpy.ndarray quadrado (sem cópia se já for 'dtype').
+    """
+    try:
+        L = np.asarray(laplacian, dtype=dtype)
+    except (TypeError, ValueError):
+        return None  # dtype objeto com entradas não numéricas
+    if L.ndim != 2 or L.shape[0] != L.shape[1]:
+        return None
+    return _gap_from_operator(L, cheby_order, return_vector, lobpcg_threshold)
+
+
+def estimate_spectral_gap_sparse(
+    laplacian: Any,
+    cheby_order: int = CHEBY_ORDER,
+    return_vector: bool = False,
+    dtype: Any = np.float64,
+    lobpcg_threshold: int = LOBPCG_THRESHOLD
+) -> Any:
+    """
+    λ2 de um Laplaciano esparso do scipy (CSR/COO/...), convertido uma vez para CSR
+    'dtype'; nunca materializa a matriz densa (exceto n <= 4).
+    """
+    L = laplacian.tocsr().astype(dtype)
+    if L.shape[0] != L.shape[1]:
+        return None
+    return _gap_from_operator(L, cheby_order, return_vector, lobpcg_threshold)
 
-    def norm2(x: Sequence[float]) -> float:
-        return math.sqrt(dot(x, x))
 
-    # Vetor constante (autoespaço para λ=0)
-    one = [1.0] * n
-    one_norm = norm2(one)
-    if one_norm == 0.0:
+def _scipy_sparse():
+    try:
+        import scipy.sparse as sp
+    except ImportError:
         return None
-    one_unit = [v / one_norm for v in one]
-
-    # Construir uma família de vetores de teste ortogonais a one_unit
-    # Base canônica e projeção ortogonal
-    test_vectors: List[List[float]] = []
-    for k in range(n):
-        e = [0.0] * n
-        e[k] = 1.0
-        # projeta e em ortogonal ao vetor constante
-        proj = dot(e, one_unit)
-        v = [e[i] - proj * one_unit[i] for i in range(n)]
-        nv = norm2(v)
-        if nv > 0:
-            test_vectors.append([vi / nv for vi in v])
-
-    if not test_vectors:
+    return sp
+
+
+def _gap_from_operator(
+    L: Any,
+    cheby_order: int = CHEBY_ORDER,
+    return_vector: bool = False,
+    lobpcg_threshold: int = LOBPCG_THRESHOLD
+) -> Any:
+    """
+    Núcleo comum: λ2 (ou (λ2, v2) com return_vector) de um operador quadrado
+    (ndarray ou CSR) já validado.
+    """
+    n = L.shape[0]
+    if n <= 1:
         return None
 
-    # Estimativa via quociente de Rayleigh: R(v) = (v^T L v) / (v^T v)
-    # Aqui v está normalizado, então R(v) = v^T L v
-    rayleigh_vals: List[float] = []
-    for v in test_vectors:
-        Lv = matvec(laplacian, v)
-        r = dot(v, Lv)
-        # Laplaciano ideal: r >= 0, mas ruído numérico pode dar negativo pequeno
-        rayleigh_vals.append(max(0.0, float(r)))
+    sp = _scipy_sparse()
+    if n <= 4:
+        dense = L.toarray() if sp is not None and sp.issparse(L) else L
+        if return_vector:
+            w, V = np.linalg.eigh(dense)
+            return float(max(0.0, w[1])), V[:, 1]
+        w = np.linalg.eigvalsh(dense)
+        return float(max(0.0, w[1]))
+
+    try:
+        from scipy.sparse.linalg import eigsh
+    except ImportError:
+        eigsh = None
+    if eigsh is None:
+        return _power_gap(L, cheby_order=int(cheby_order), return_vector=return_vector)
+
+    if n > lobpcg_threshold:
+        res = _lobpcg_gap(L, sp)
+        if res is not None:
+            return res if return_vector else res[0]
+
+    # L é singular (constantes no kernel): o deslocamento sigma levemente negativo
+    # torna L - sigma I definida positiva; os 2 autovalores mais próximos são 0 e λ2.
+    # |sigma| acompanha a resolução do dtype (em float32, 1e-8 some e a fatoração é singular).
+    sigma = -math.sqrt(float(np.finfo(L.dtype).eps)) * max(1.0, float(np.abs(L.diagonal()).max()))
+    try:
+        res = eigsh(L, k=2, sigma=sigma, which="LM", return_eigenvectors=return_vector)
+    except Exception:
+        return _power_gap(L, cheby_order=int(cheby_order), return_vector=return_vector)
+    if not return_vector:
+        return float(max(0.0, np.sort(res)[1]))
+    w, V = res
+    i2 = int(np.argsort(w)[1])
+    return float(max(0.0, w[i2])), V[:, i2]
 
-    # A melhor estimativa para λ2 é o mínimo quociente de Rayleigh no subespaço ortogonal
-    lam2_est = min(rayleigh_vals) if rayleigh_vals else None
-    return lam2_est
+
+# Textos fixos do certificado, compartilhados por todas as chamadas (nomes de método internados)
+_NOTES = (
+    "δ normalizado para [0,1). Substitua por cota espectral rigorosa "
+    "quando disponível (ex.: λ2/Λ, isoperimétrico, ou Axioma 2 analítico)."
+)
+METHOD_EXPLICIT = sys.intern("explicit-lower-bound")
+METHOD_LAPLACIAN = sys.intern("discrete-laplacian-ratio")
+METHOD_SAMPLES = sys.intern("spectral-samples-heuristic")
+METHOD_FALLBACK = sys.intern("fallback-zero")
 
 
 def assemble_delta_certificate(
@@ -136,14 +389,76 @@ def assemble_delta_certificate(
         "raw_value": raw_value,
         "normalized": normalized_delta,
         "context": context,
-        "notes": (
-            "δ normalizado para [0,1). Substitua por cota espectral rigorosa "
-            "quando disponível (ex.: λ2/Λ, isoperimétrico, ou Axioma 2 analítico)."
-        ),
+        "notes": _NOTES,
     }
 
 
+# Memo LRU de compute_delta: (g, digest canônico de family_data) -> resultado
+DELTA_CACHE_SIZE = 256
+_DELTA_CACHE: "OrderedDict[Tuple[int, str], Dict[str, Any]]" = OrderedDict()
+
+
+def _to_jsonable(obj: Any) -> Any:
+    """
+    Representação JSON estável para o digest: arrays e matrizes esparsas entram pelo
+    hash dos seus bytes (forma + dtype + data/indices/indptr no caso CSR), sem tolist().
+    Arrays de dtype objeto (bytes = ponteiros) não têm forma canônica: TypeError.
+    """
+    if getattr(obj, "dtype", None) is not None and obj.dtype.kind == "O":
+        raise TypeError("array de dtype objeto não é digerível por bytes")
+    if isinstance(obj, np.ndarray):
+        h = hashlib.blake2b(np.ascontiguousarray(obj).tobytes(), digest_size=16)
+        return {"__ndarray__": h.hexdigest(), "shape": list(obj.shape), "dtype": str(obj.dtype)}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, "tocsr"):
+        m = obj.tocsr()
+        h = hashlib.blake2b(digest_size=16)
+        for part in (m.data, m.indices, m.indptr):
+            h.update(np.ascontiguousarray(part).tobytes())
+        return {"__sparse__": h.hexdigest(), "shape": list(m.shape), "dtype": str(m.dtype)}
+    raise TypeError(f"não serializável para o digest: {type(obj).__name__}")
+
+
+# Chaves com dados volumosos: como lista/tupla Python, o JSON canônico custaria mais
+# que o próprio cálculo, então só ndarray/esparso (digest por bytes) é memoizado
+_BULK_KEYS = ("laplacian", "spectral_samples")
+
+
+def _family_digest(family_data: Dict[str, Any]) -> Optional[str]:
+    if any(isinstance(family_data.get(k), (list, tuple)) for k in _BULK_KEYS):
+        return None
+    try:
+        blob = json.dumps(family_data, sort_keys=True, default=_to_jsonable)
+    except (TypeError, ValueError):
+        return None  # conteúdo sem forma canônica: não memoiza
+    return hashlib.blake2b(blob.encode("utf-8")).hexdigest()
+
+
 def compute_delta(g: int, family_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    compute_delta memoizado: δ é puro em (g, family_data), então varreduras repetidas
+    reutilizam o resultado (LRU de DELTA_CACHE_SIZE entradas, chave = digest blake2b
+    do JSON canônico de family_data). Retorna sempre uma cópia independente.
+    Laplaciano/amostras em lista Python ou arrays de dtype objeto não são memoizados.
+    Ver _compute_delta_uncached para as estratégias.
+    """
+    digest = _family_digest(family_data)
+    if digest is None:
+        return _compute_delta_uncached(g, family_data)
+    key = (g, digest)
+    hit = _DELTA_CACHE.get(key)
+    if hit is None:
+        hit = _compute_delta_uncached(g, family_data)
+        _DELTA_CACHE[key] = hit
+        if len(_DELTA_CACHE) > DELTA_CACHE_SIZE:
+            _DELTA_CACHE.popitem(last=False)
+    else:
+        _DELTA_CACHE.move_to_end(key)
+    return copy.deepcopy(hit)
+
+
+def _compute_delta_uncached(g: int, family_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Placeholder espectral auditável para δ (Axioma 2).
 
@@ -158,14 +473,22 @@ def compute_delta(g: int, family_data: Dict[str, Any]) -> Dict[str, Any]:
     Parâmetros opcionais:
       - "clip_eps": tolerância para clipping superior de δ (default 1e-12).
       - "force_cap": valor máximo manual para δ antes da normalização (opcional).
+      - "cheby_order": ordem do filtro de Chebyshev no fallback sem scipy (default 12).
+      - "include_fiedler": se True, grava o vetor de Fiedler (v2) em
+        certificate["context"]["fiedler"] (default False, para não inflar certificados).
+      - "precision": "low" ou "fp32" estima λ2 em float32 (basta para um δ clipado).
+      - "lobpcg_threshold": n acima do qual se tenta LOBPCG antes do eigsh (default 5000).
+      - "return_delta_only": se True, devolve só {"delta": ...}, sem montar o
+        certificado (a chave "certificate" fica ausente); útil em varreduras.
 
     Retorno:
       {
         "delta": float,
-        "certificate": {...}
+        "certificate": {...}   # ausente se return_delta_only
       }
     """
     clip_eps = float(family_data.get("clip_eps", 1e-12))
+    delta_only = bool(family_data.get("return_delta_only", False))
 
     # 1) Bound explícito fornecido
     if "delta_lower_bound" in family_data:
@@ -181,23 +504,44 @@ def compute_delta(g: int, family_data: Dict[str, Any]) -> Dict[str, Any]:
             except Exception:
                 pass
         delta_norm = normalize_delta(raw, eps=clip_eps)
+        if delta_only:
+            return {"delta": delta_norm}
         cert = assemble_delta_certificate(
-            method="explicit-lower-bound",
+            method=METHOD_EXPLICIT,
             raw_value=raw,
             normalized_delta=delta_norm,
             context={"g": g, "source": "family_data.delta_lower_bound"}
         )
         return {"delta": delta_norm, "certificate": cert}
 
-    # 2) Estimativa via Laplaciano discreto
+    # 2) Estimativa via Laplaciano discreto (esparso do scipy, ndarray ou lista de listas)
     lap = family_data.get("laplacian", None)
     lambda_scale = family_data.get("lambda_scale", None)
     if lap is not None and lambda_scale is not None:
+        sp = _scipy_sparse()
+        is_sparse = sp is not None and sp.issparse(lap)
+        if is_sparse or isinstance(lap, np.ndarray):
+            matrix_size = int(lap.shape[0])
+        else:
+            matrix_size = len(lap) if isinstance(lap, (list, tuple)) else None
+        include_fiedler = bool(family_data.get("include_fiedler", False))
+        lam2 = None
+        fiedler = None
         try:
             lam_scale = float(lambda_scale)
             if lam_scale <= 0:
                 raise ValueError
-            lam2 = estimate_spectral_gap(lap)
+            cheby_order = int(family_data.get("cheby_order", CHEBY_ORDER))
+            dtype = np.float32 if family_data.get("precision") in ("low", "fp32") else np.float64
+            lobpcg_threshold = int(family_data.get("lobpcg_threshold", LOBPCG_THRESHOLD))
+            est = estimate_spectral_gap(
+                lap,
+                cheby_order=cheby_order,
+                return_vector=include_fiedler,
+                dtype=dtype,
+                lobpcg_threshold=lobpcg_threshold
+            )
+            lam2, fiedler = est if include_fiedler and est is not None else (est, None)
             if lam2 is None:
                 raw = 0.0
             else:
@@ -212,28 +556,39 @@ def compute_delta(g: int, family_data: Dict[str, Any]) -> Dict[str, Any]:
             except Exception:
                 pass
         delta_norm = normalize_delta(raw, eps=clip_eps)
+        if delta_only:
+            return {"delta": delta_norm}
+        context = {
+            "g": g,
+            "lambda_scale": lambda_scale,
+            "lam2_estimate": lam2,
+            "matrix_size": matrix_size
+        }
+        if include_fiedler:
+            context["fiedler"] = None if fiedler is None else np.asarray(fiedler, dtype=np.float64).tolist()
         cert = assemble_delta_certificate(
-            method="discrete-laplacian-ratio",
+            method=METHOD_LAPLACIAN,
             raw_value=raw,
             normalized_delta=delta_norm,
-            context={
-                "g": g,
-                "lambda_scale": lambda_scale,
-                "lam2_estimate": lam2,
-                "matrix_size": len(lap) if isinstance(lap, (list, tuple)) else None
-            }
+            context=context
         )
         return {"delta": delta_norm, "certificate": cert}
 
     # 3) Heurística via amostras espectrais positivas
     samples = family_data.get("spectral_samples", None)
-    if isinstance(samples, (list, tuple)) and len(samples) > 0:
-        # Considera apenas valores positivos
-        pos = [float(x) for x in samples if isinstance(x, (int, float)) and float(x) > 0.0]
-        if len(pos) >= 2:
-            smin, smax = min(pos), max(pos)
+    if isinstance(samples, (list, tuple, np.ndarray)) and len(samples) > 0:
+        # Considera apenas valores positivos (NaN cai fora pela comparação)
+        arr = np.asarray(samples)
+        if arr.ndim == 1 and arr.dtype.kind in "biuf":
+            arr = arr.astype(np.float64, copy=False)
+        else:
+            # entradas mistas: ignora não numéricos, como antes
+            arr = np.array([float(x) for x in samples if isinstance(x, (int, float))], dtype=np.float64)
+        pos = arr[arr > 0.0]
+        if pos.size >= 2:
+            smin, smax = float(pos.min()), float(pos.max())
             raw = 0.0 if smax == 0.0 else min(1.0, smin / smax)
-        elif len(pos) == 1:
+        elif pos.size == 1:
             # Com um único valor, δ_raw é 1 "teoricamente", mas adotamos algo conservador
             raw = 0.5
         else:
@@ -246,19 +601,23 @@ def compute_delta(g: int, family_data: Dict[str, Any]) -> Dict[str, Any]:
             except Exception:
                 pass
         delta_norm = normalize_delta(raw, eps=clip_eps)
+        if delta_only:
+            return {"delta": delta_norm}
         cert = assemble_delta_certificate(
-            method="spectral-samples-heuristic",
+            method=METHOD_SAMPLES,
             raw_value=raw,
             normalized_delta=delta_norm,
-            context={"g": g, "n_samples": len(pos)}
+            context={"g": g, "n_samples": int(pos.size)}
         )
         return {"delta": delta_norm, "certificate": cert}
 
     # 4) Fallback
     raw = 0.0
     delta_norm = normalize_delta(raw, eps=clip_eps)
+    if delta_only:
+        return {"delta": delta_norm}
     cert = assemble_delta_certificate(
-        method="fallback-zero",
+        method=METHOD_FALLBACK,
         raw_value=raw,
         normalized_delta=delta_norm,
         context={"g": g}